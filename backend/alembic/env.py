@@ -36,6 +36,21 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+# Search index objects created by DDL events rather than declared on the models
+SEARCH_TABLE_PREFIXES = ("tasks_fts", "tasks_trgm", "categories_trgm")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate away from the search index objects managed outside the models."""
+    if type_ == "table" and name.startswith(SEARCH_TABLE_PREFIXES):
+        return False
+    if type_ == "index" and (name == "ix_tasks_search_vector" or name.endswith("_trgm")):
+        return False
+    if type_ == "column" and name == "search_vector":
+        return False
+    return True
+
+
 def get_url():
     """Get database URL from settings."""
     return settings.DATABASE_URL
@@ -59,6 +74,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -83,7 +99,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,76 @@
+"""Convert task order_index from floats to fractional-index order keys
+
+Revision ID: a2d6e8c4f1b7
+Revises: f1c7b3a8e9d5
+Create Date: 2026-10-17 14:05:31.906417
+
+"""
+from itertools import groupby
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+from app.core.ordering import generate_n_keys_between
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2d6e8c4f1b7'
+down_revision = 'f1c7b3a8e9d5'
+branch_labels = None
+depends_on = None
+
+
+def _order_key_type():
+    return sa.String(255).with_variant(sa.String(255, collation='C'), 'postgresql')
+
+
+def _drop_order_indexes() -> None:
+    op.drop_index('ix_tasks_user_pending_order', table_name='tasks')
+    op.drop_index('ix_tasks_user_order', table_name='tasks')
+
+
+def _create_order_indexes() -> None:
+    op.create_index('ix_tasks_user_order', 'tasks', ['user_id', 'order_index', 'id'], unique=False)
+    op.create_index(
+        'ix_tasks_user_pending_order', 'tasks', ['user_id', 'order_index', 'id'], unique=False,
+        postgresql_where=sa.text('completed = false'), sqlite_where=sa.text('completed = 0')
+    )
+
+
+def _replace_order_column(new_type, values) -> None:
+    """Swap tasks.order_index for a column of new_type filled with values ({id: value})."""
+    _drop_order_indexes()
+    op.add_column('tasks', sa.Column('order_index_new', new_type, nullable=True))
+    if values:
+        op.get_bind().execute(
+            text("UPDATE tasks SET order_index_new = :value WHERE id = :id"),
+            [{"id": task_id, "value": value} for task_id, value in values.items()]
+        )
+    # Plain DROP/RENAME COLUMN rather than batch mode: rebuilding the table on SQLite
+    # would drop the full-text search triggers defined on it
+    op.drop_column('tasks', 'order_index')
+    op.execute(text("ALTER TABLE tasks RENAME COLUMN order_index_new TO order_index"))
+    _create_order_indexes()
+
+
+def _tasks_in_order():
+    return op.get_bind().execute(text(
+        "SELECT id, user_id FROM tasks ORDER BY user_id, order_index, id"
+    )).all()
+
+
+def upgrade() -> None:
+    # Keep each user's current order; keys are evenly spaced from the start
+    keys = {}
+    for _, rows in groupby(_tasks_in_order(), key=lambda row: row.user_id):
+        task_ids = [row.id for row in rows]
+        keys.update(zip(task_ids, generate_n_keys_between(None, None, len(task_ids))))
+    _replace_order_column(_order_key_type(), keys)
+    if op.get_bind().dialect.name != 'sqlite':
+        op.alter_column('tasks', 'order_index', existing_type=_order_key_type(), nullable=False)
+
+
+def downgrade() -> None:
+    positions = {}
+    for _, rows in groupby(_tasks_in_order(), key=lambda row: row.user_id):
+        positions.update({row.id: (index + 1) * 1000.0 for index, row in enumerate(rows)})
+    _replace_order_column(sa.Float(), positions)
@@ -0,0 +1,24 @@
+"""Add users.tombstones_pruned_version for the task tombstone retention horizon
+
+Revision ID: a3d8f6c1e9b5
+Revises: c6a9e3d7b2f8
+Create Date: 2026-10-17 21:04:12.518340
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d8f6c1e9b5'
+down_revision = 'c6a9e3d7b2f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('tombstones_pruned_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'tombstones_pruned_version')
@@ -0,0 +1,24 @@
+"""Add a per-user collection version for conditional GETs
+
+Revision ID: b4e7f2a9c6d1
+Revises: a2d6e8c4f1b7
+Create Date: 2026-10-17 16:48:12.550931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e7f2a9c6d1'
+down_revision = 'a2d6e8c4f1b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('collection_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'collection_version')
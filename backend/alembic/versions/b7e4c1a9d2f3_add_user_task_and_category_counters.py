@@ -0,0 +1,34 @@
+"""Add maintained task and category counters to users
+
+Revision ID: b7e4c1a9d2f3
+Revises: 42c38f32140e
+Create Date: 2026-10-17 09:12:40.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e4c1a9d2f3'
+down_revision = '42c38f32140e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('task_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('users', sa.Column('category_count', sa.Integer(), nullable=False, server_default='0'))
+    
+    # Backfill the counters from the existing rows
+    op.execute(text("""
+        UPDATE users
+        SET task_count = (SELECT COUNT(*) FROM tasks WHERE tasks.user_id = users.id),
+            category_count = (SELECT COUNT(*) FROM categories WHERE categories.user_id = users.id)
+    """))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'category_count')
+    op.drop_column('users', 'task_count')
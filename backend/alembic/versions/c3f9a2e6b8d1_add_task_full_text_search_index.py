@@ -0,0 +1,72 @@
+"""Add full-text search index for tasks
+
+Revision ID: c3f9a2e6b8d1
+Revises: b7e4c1a9d2f3
+Create Date: 2026-10-17 10:02:15.774031
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f9a2e6b8d1'
+down_revision = 'b7e4c1a9d2f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    
+    if dialect == 'postgresql':
+        # Generated column keeps itself in sync on every write; filled for existing rows here
+        op.execute(text("""
+            ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+            ) STORED
+        """))
+        op.execute(text("CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)"))
+    
+    elif dialect == 'sqlite':
+        op.execute(text("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts
+            USING fts5(title, description, content='tasks', content_rowid='id')
+        """))
+        op.execute(text("""
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+            END
+        """))
+        op.execute(text("""
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END
+        """))
+        op.execute(text("""
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+                INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+            END
+        """))
+        # Index the existing rows
+        op.execute(text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    
+    if dialect == 'postgresql':
+        op.execute(text("DROP INDEX IF EXISTS ix_tasks_search_vector"))
+        op.execute(text("ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector"))
+    
+    elif dialect == 'sqlite':
+        op.execute(text("DROP TRIGGER IF EXISTS tasks_fts_au"))
+        op.execute(text("DROP TRIGGER IF EXISTS tasks_fts_ad"))
+        op.execute(text("DROP TRIGGER IF EXISTS tasks_fts_ai"))
+        op.execute(text("DROP TABLE IF EXISTS tasks_fts"))
@@ -0,0 +1,49 @@
+"""Add task change versions and task tombstones for delta sync
+
+Revision ID: c6a9e3d7b2f8
+Revises: b4e7f2a9c6d1
+Create Date: 2026-10-17 18:22:41.306127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6a9e3d7b2f8'
+down_revision = 'b4e7f2a9c6d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('change_version', sa.Integer(), nullable=False, server_default='0'))
+    
+    # Existing tasks count as changed at their user's current version
+    op.execute(text("""
+        UPDATE tasks SET change_version = COALESCE((
+            SELECT users.collection_version FROM users WHERE users.id = tasks.user_id
+        ), 0)
+    """))
+    op.create_index('ix_tasks_user_change', 'tasks', ['user_id', 'change_version', 'id'], unique=False)
+    
+    op.create_table('task_tombstones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('change_version', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_task_tombstones_user_change', 'task_tombstones', ['user_id', 'change_version'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_tombstones_user_change', table_name='task_tombstones')
+    op.drop_table('task_tombstones')
+    op.drop_index('ix_tasks_user_change', table_name='tasks')
+    op.drop_column('tasks', 'change_version')
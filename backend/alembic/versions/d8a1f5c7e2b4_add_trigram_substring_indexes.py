@@ -0,0 +1,78 @@
+"""Add trigram indexes for substring search on tasks and categories
+
+Revision ID: d8a1f5c7e2b4
+Revises: c3f9a2e6b8d1
+Create Date: 2026-10-17 10:41:52.106387
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8a1f5c7e2b4'
+down_revision = 'c3f9a2e6b8d1'
+branch_labels = None
+depends_on = None
+
+
+# (source table, trigram table, indexed columns)
+TRIGRAM_MIRRORS = [
+    ('tasks', 'tasks_trgm', ['title', 'description']),
+    ('categories', 'categories_trgm', ['name', 'description']),
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    
+    if dialect == 'postgresql':
+        # pg_trgm GIN indexes serve ILIKE '%term%' directly
+        op.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for source, _, columns in TRIGRAM_MIRRORS:
+            for column in columns:
+                op.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{source}_{column}_trgm "
+                    f"ON {source} USING GIN ({column} gin_trgm_ops)"
+                ))
+    
+    elif dialect == 'sqlite':
+        # FTS5 trigram tables (SQLite 3.34+) kept in sync by triggers
+        for source, name, columns in TRIGRAM_MIRRORS:
+            column_list = ", ".join(columns)
+            new_values = ", ".join(f"new.{c}" for c in columns)
+            old_values = ", ".join(f"old.{c}" for c in columns)
+            insert_new = f"INSERT INTO {name}(rowid, {column_list}) VALUES (new.id, {new_values});"
+            delete_old = (
+                f"INSERT INTO {name}({name}, rowid, {column_list}) "
+                f"VALUES ('delete', old.id, {old_values});"
+            )
+            
+            op.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5("
+                f"{column_list}, content='{source}', content_rowid='id', tokenize='trigram')"
+            ))
+            op.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {source} BEGIN {insert_new} END"))
+            op.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {source} BEGIN {delete_old} END"))
+            op.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {column_list} ON {source} "
+                f"BEGIN {delete_old} {insert_new} END"
+            ))
+            # Index the existing rows
+            op.execute(text(f"INSERT INTO {name}({name}) VALUES ('rebuild')"))
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    
+    if dialect == 'postgresql':
+        for source, _, columns in TRIGRAM_MIRRORS:
+            for column in columns:
+                op.execute(text(f"DROP INDEX IF EXISTS ix_{source}_{column}_trgm"))
+    
+    elif dialect == 'sqlite':
+        for _, name, _ in TRIGRAM_MIRRORS:
+            for suffix in ('au', 'ad', 'ai'):
+                op.execute(text(f"DROP TRIGGER IF EXISTS {name}_{suffix}"))
+            op.execute(text(f"DROP TABLE IF EXISTS {name}"))
@@ -0,0 +1,62 @@
+"""Add composite and partial task indexes, drop single-column ones
+
+Revision ID: e5b2d9f4a6c3
+Revises: d8a1f5c7e2b4
+Create Date: 2026-10-17 11:20:07.482915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b2d9f4a6c3'
+down_revision = 'd8a1f5c7e2b4'
+branch_labels = None
+depends_on = None
+
+
+# Single-column indexes superseded by the composites (or by the primary key)
+DROPPED_INDEXES = [
+    ('ix_tasks_id', ['id']),
+    ('ix_tasks_user_id', ['user_id']),
+    ('ix_tasks_title', ['title']),
+    ('ix_tasks_completed', ['completed']),
+    ('ix_tasks_priority', ['priority']),
+    ('ix_tasks_due_date', ['due_date']),
+    ('ix_tasks_order_index', ['order_index']),
+]
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_user_order', 'tasks', ['user_id', 'order_index', 'id'], unique=False)
+    op.create_index('ix_tasks_user_title', 'tasks', ['user_id', 'title'], unique=False)
+    op.create_index('ix_tasks_user_priority', 'tasks', ['user_id', 'priority'], unique=False)
+    op.create_index('ix_tasks_user_created', 'tasks', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_user_completed_due', 'tasks', ['user_id', 'completed', 'due_date'], unique=False)
+    
+    pending = sa.text('completed = false')
+    op.create_index(
+        'ix_tasks_user_pending_due', 'tasks', ['user_id', 'due_date'], unique=False,
+        postgresql_where=pending, sqlite_where=sa.text('completed = 0')
+    )
+    op.create_index(
+        'ix_tasks_user_pending_order', 'tasks', ['user_id', 'order_index', 'id'], unique=False,
+        postgresql_where=pending, sqlite_where=sa.text('completed = 0')
+    )
+    
+    for name, _ in DROPPED_INDEXES:
+        op.drop_index(name, table_name='tasks', if_exists=True)
+
+
+def downgrade() -> None:
+    for name, columns in DROPPED_INDEXES:
+        op.create_index(name, 'tasks', columns, unique=False, if_not_exists=True)
+    
+    op.drop_index('ix_tasks_user_pending_order', table_name='tasks')
+    op.drop_index('ix_tasks_user_pending_due', table_name='tasks')
+    op.drop_index('ix_tasks_user_completed_due', table_name='tasks')
+    op.drop_index('ix_tasks_user_created', table_name='tasks')
+    op.drop_index('ix_tasks_user_priority', table_name='tasks')
+    op.drop_index('ix_tasks_user_title', table_name='tasks')
+    op.drop_index('ix_tasks_user_order', table_name='tasks')
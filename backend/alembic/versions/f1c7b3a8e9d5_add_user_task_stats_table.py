@@ -0,0 +1,49 @@
+"""Add user_task_stats summary table
+
+Revision ID: f1c7b3a8e9d5
+Revises: e5b2d9f4a6c3
+Create Date: 2026-10-17 12:05:33.917640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c7b3a8e9d5'
+down_revision = 'e5b2d9f4a6c3'
+branch_labels = None
+depends_on = None
+
+
+PRIORITY_COLUMNS = [f'priority_{priority}' for priority in range(1, 11)]
+
+
+def upgrade() -> None:
+    op.create_table('user_task_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed', sa.Integer(), nullable=False, server_default='0'),
+        *[sa.Column(column, sa.Integer(), nullable=False, server_default='0') for column in PRIORITY_COLUMNS],
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    
+    # Backfill from the existing tasks
+    priority_counts = ", ".join(
+        f"COUNT(CASE WHEN tasks.priority = {priority} THEN 1 END)" for priority in range(1, 11)
+    )
+    op.execute(text(f"""
+        INSERT INTO user_task_stats (user_id, total, completed, {", ".join(PRIORITY_COLUMNS)})
+        SELECT users.id,
+               COUNT(tasks.id),
+               COUNT(CASE WHEN tasks.completed THEN 1 END),
+               {priority_counts}
+        FROM users LEFT OUTER JOIN tasks ON tasks.user_id = users.id
+        GROUP BY users.id
+    """))
+
+
+def downgrade() -> None:
+    op.drop_table('user_task_stats')
@@ -4,10 +4,12 @@ Authentication API endpoints.
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.core.auth import create_access_token, get_current_active_user, ACCESS_TOKEN_EXPIRE_MINUTES
-from app.crud.user import create_user, authenticate_user, get_user_by_email, update_user
+from app.core.database import DBSession, get_session
+from app.core.auth import (
+    create_access_token, get_current_active_user, hash_password, check_password, PasswordHashingBusy,
+    ACCESS_TOKEN_EXPIRE_MINUTES
+)
+from app.crud.aio import create_user, get_user_by_email, update_user, update_password_hash
 from app.schemas.auth import UserCreate, UserLogin, UserUpdate, UserResponse, Token, AuthResponse
 from app.models.user import User
 
@@ -16,19 +18,32 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 security = HTTPBearer()
 
 
+def _password_hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Password hashing is busy, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: DBSession = Depends(get_session)):
     """Register a new user."""
     # Check if user already exists
-    if get_user_by_email(db, user.email):
+    if await get_user_by_email(db, user.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this email already exists"
         )
     
+    try:
+        hashed_password = await hash_password(user.password)
+    except PasswordHashingBusy:
+        raise _password_hashing_busy()
+    
     try:
         # Create new user
-        db_user = create_user(db, user)
+        db_user = await create_user(db, user, hashed_password=hashed_password)
         
         # Create access token
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -52,17 +67,27 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=AuthResponse)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: DBSession = Depends(get_session)):
     """Login user and return access token."""
     # Authenticate user
-    user = authenticate_user(db, user_credentials.email, user_credentials.password)
-    if not user:
+    user = await get_user_by_email(db, user_credentials.email)
+    try:
+        valid, new_hash = (
+            await check_password(user_credentials.password, user.hashed_password) if user else (False, None)
+        )
+    except PasswordHashingBusy:
+        raise _password_hashing_busy()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade a hash made with an outdated bcrypt cost
+    if new_hash:
+        user = await update_password_hash(db, user.id, new_hash)
+    
     # Create access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -89,11 +114,11 @@ async def get_current_user_info(current_user: User = Depends(get_current_active_
 async def update_current_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
     """Update current user information."""
     try:
-        updated_user = update_user(db, current_user.id, user_update)
+        updated_user = await update_user(db, current_user.id, user_update)
         if not updated_user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1,14 +1,15 @@
 """
 API routes for category operations.
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from typing import Optional
-from app.core.database import get_db
-from app.core.auth import get_current_active_user
+from app.core.database import DBSession, get_session
+from app.core.auth import get_current_active_user, get_read_session
+from app.core.etag import collection_etag, collection_headers, etag_matches
 from app.models.user import User
-from app.crud.category import (
+from app.crud.aio import (
     get_categories_with_filters,
+    get_user_counters,
     create_category as crud_create_category,
     get_category_by_id,
     update_category as crud_update_category,
@@ -22,25 +23,40 @@ router = APIRouter(prefix="/categories", tags=["categories"])
 
 @router.get("/", response_model=CategoryListResponse)
 async def get_categories(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
     skip: int = Query(0, ge=0, description="Number of categories to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of categories to return"),
     search: Optional[str] = Query(None, description="Search term for name or description"),
     sort_by: str = Query("name", description="Sort field (name, created_at)"),
-    sort_order: str = Query("asc", description="Sort order (asc, desc)")
+    sort_order: str = Query("asc", description="Sort order (asc, desc)"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="How to compute total (exact, estimated, none); estimated is a planner estimate on PostgreSQL and exact elsewhere")
 ):
-    """Get list of categories with filtering and sorting."""
-    categories, total = get_categories_with_filters(
+    """
+    Get list of categories with filtering and sorting.
+    
+    Sends a strong ETag; a matching If-None-Match gets 304 without running the list.
+    """
+    counters = await get_user_counters(db, current_user.id)
+    etag = collection_etag(request, current_user.id, counters["collection_version"])
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=collection_headers(etag))
+    
+    categories, total = await get_categories_with_filters(
         db=db,
         user_id=current_user.id,
         skip=skip,
         limit=limit,
         search=search,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        count_mode=count,
+        counters=counters
     )
     
+    response.headers.update(collection_headers(etag))
     return CategoryListResponse(
         categories=categories,
         total=total,
@@ -53,25 +69,25 @@ async def get_categories(
 async def create_category(
     category: CategoryCreate, 
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
     """Create a new category."""
     # Check for duplicate name within user's categories
-    existing_category = get_category_by_name(db, name=category.name, user_id=current_user.id)
+    existing_category = await get_category_by_name(db, name=category.name, user_id=current_user.id)
     if existing_category:
         raise HTTPException(status_code=409, detail=f"Category with name '{category.name}' already exists")
     
-    return crud_create_category(db=db, category_data=category, user_id=current_user.id)
+    return await crud_create_category(db=db, category_data=category, user_id=current_user.id)
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
 async def get_category(
     category_id: int, 
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_read_session)
 ):
     """Get a specific category by ID."""
-    category = get_category_by_id(db=db, category_id=category_id, user_id=current_user.id)
+    category = await get_category_by_id(db=db, category_id=category_id, user_id=current_user.id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     return category
@@ -82,16 +98,16 @@ async def update_category(
     category_id: int, 
     category_update: CategoryUpdate, 
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
     """Update a category."""
     # Check for duplicate name if name is being updated
     if category_update.name:
-        existing_category = get_category_by_name(db, name=category_update.name, user_id=current_user.id)
+        existing_category = await get_category_by_name(db, name=category_update.name, user_id=current_user.id)
         if existing_category and existing_category.id != category_id:
             raise HTTPException(status_code=409, detail=f"Category with name '{category_update.name}' already exists")
     
-    updated_category = crud_update_category(db=db, category_id=category_id, category_data=category_update, user_id=current_user.id)
+    updated_category = await crud_update_category(db=db, category_id=category_id, category_data=category_update, user_id=current_user.id)
     if not updated_category:
         raise HTTPException(status_code=404, detail="Category not found")
     
@@ -102,10 +118,10 @@ async def update_category(
 async def delete_category(
     category_id: int, 
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
     """Delete a category."""
-    success = crud_delete_category(db=db, category_id=category_id, user_id=current_user.id)
+    success = await crud_delete_category(db=db, category_id=category_id, user_id=current_user.id)
     if not success:
         raise HTTPException(status_code=404, detail="Category not found")
     return None
@@ -1,20 +1,33 @@
 """
 API routes for task operations.
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import Optional, List
-from app.core.database import get_db
-from app.core.auth import get_current_active_user
+import csv
+import io
+import json
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Iterator, Optional, List, Tuple
+from app.core.database import DBSession, background_session, get_session, read_session_factory
+from app.core.auth import get_current_active_user, get_read_session
+from app.core.config import settings
+from app.core.encoding import FastJSONResponse, dumps
+from app.core.etag import collection_etag, collection_headers, etag_matches
 from app.models.user import User
-from app.crud.task import (
+from app.crud.aio import (
     get_tasks_with_filters,
+    get_user_counters,
     create_task as crud_create_task,
     get_task_by_id,
     update_task as crud_update_task,
+    bulk_update_tasks as crud_bulk_update_tasks,
     delete_task as crud_delete_task,
     toggle_task_completion,
     reorder_task as crud_reorder_task,
+    reorder_tasks as crud_reorder_tasks,
+    rebalance_user_order_keys,
+    bulk_delete_tasks as crud_bulk_delete_tasks,
+    bulk_toggle_tasks as crud_bulk_toggle_tasks,
     get_task_by_title,
     get_overdue_tasks,
     get_tasks_due_today,
@@ -23,17 +36,90 @@ from app.crud.task import (
     get_pending_tasks,
     search_tasks_full_text,
     search_tasks_by_multiple_criteria,
-    get_task_statistics
+    get_task_statistics,
+    get_task_changes,
+    create_tasks_batch as crud_create_tasks_batch,
+    import_task_chunk
+)
+from app.crud.task import (
+    ChangeCursorExpired,
+    needs_order_rebalance,
+    new_import_report,
+    reject_import_row,
+    TASK_IMPORT_CHUNK_SIZE,
+    TASK_EXPORT_COLUMNS,
+    stream_user_tasks,
+    parse_task_fields
+)
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskListResponse, TaskReorder, BulkTaskUpdate, TaskImportResponse,
+    TaskChangesResponse
 )
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskListResponse, TaskReorder, BulkTaskUpdate
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+# Larger uploads go through the streamed NDJSON import instead
+MAX_TASK_BATCH_SIZE = 1000
+
+# Export output is sent in pieces of about this many characters
+EXPORT_FLUSH_SIZE = 64 * 1024
+
+# Longest accepted NDJSON line; longer lines are rejected without being buffered
+MAX_IMPORT_LINE_BYTES = 64 * 1024
+
+
+# Related objects the task list and search endpoints can embed with ``include``
+TASK_INCLUDES = {"category"}
+
+
+def _task_shape(fields: Optional[str], include: Optional[str]) -> Tuple[Optional[Tuple[str, ...]], bool, bool]:
+    """
+    Resolve the ``fields`` and ``include`` parameters into (fields, include_category, as_rows).
+    
+    Without either the full representation is returned, category included;
+    with ``fields`` the category is embedded only when ``include=category``.
+    Anything but the full representation is served from plain rows (as_rows),
+    as is everything with FAST_JSON_RESPONSES.
+    """
+    try:
+        task_fields = parse_task_fields(fields) if fields else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if include is None:
+        include_category = task_fields is None
+    else:
+        includes = {name.strip() for name in include.split(",") if name.strip()}
+        unknown = sorted(includes - TASK_INCLUDES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(unknown)}")
+        include_category = "category" in includes
+    as_rows = settings.FAST_JSON_RESPONSES or task_fields is not None or not include_category
+    return task_fields, include_category, as_rows
+
+
+# Query parameters shared by the task list and search endpoints
+_FIELDS_QUERY = Query(None, description="Comma-separated task fields to return, e.g. title,completed,due_date (default: all)")
+_INCLUDE_QUERY = Query(None, description="Related objects to embed: category (default: category unless fields is given)")
+
+
+async def _rebalance_order_keys(user_id: int) -> None:
+    """Background job: renormalize a user's order keys after one grew too long."""
+    async with background_session(user_id) as db:
+        await rebalance_user_order_keys(db, user_id)
+
+
+def _schedule_rebalance(background_tasks: BackgroundTasks, user_id: int, tasks) -> None:
+    """Queue a rebalance of the user's order keys if any of the tasks needs one."""
+    if needs_order_rebalance(tasks):
+        background_tasks.add_task(_rebalance_order_keys, user_id)
+
 
 @router.get("/", response_model=TaskListResponse)
 async def get_tasks(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
     skip: int = Query(0, ge=0, description="Number of tasks to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of tasks to return"),
     search: Optional[str] = Query(None, description="Search term for title or description"),
@@ -43,91 +129,213 @@ async def get_tasks(
     due_date_from: Optional[str] = Query(None, description="Filter by due date from (YYYY-MM-DD)"),
     due_date_to: Optional[str] = Query(None, description="Filter by due date to (YYYY-MM-DD)"),
     sort_by: str = Query("order_index", description="Sort field (title, priority, due_date, created_at, order_index)"),
-    sort_order: str = Query("asc", description="Sort order (asc, desc)")
+    sort_order: str = Query("asc", description="Sort order (asc, desc)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor (overrides skip)"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="How to compute total (exact, estimated, none); estimated is a planner estimate on PostgreSQL and exact elsewhere"),
+    fields: Optional[str] = _FIELDS_QUERY,
+    include: Optional[str] = _INCLUDE_QUERY
 ):
-    """Get list of tasks with filtering, searching, and sorting."""
-    tasks, total = get_tasks_with_filters(
-        db=db,
-        user_id=current_user.id,
-        skip=skip,
-        limit=limit,
-        search=search,
-        completed=completed,
-        category_id=category_id,
-        priority=priority,
-        due_date_from=due_date_from,
-        due_date_to=due_date_to,
-        sort_by=sort_by,
-        sort_order=sort_order
-    )
+    """
+    Get list of tasks with filtering, searching, and sorting.
+    
+    Sends a strong ETag; a matching If-None-Match gets 304 without running the list.
+    With FAST_JSON_RESPONSES, ``fields`` or ``include`` the page is encoded
+    from plain rows holding only the requested data.
+    """
+    task_fields, include_category, as_rows = _task_shape(fields, include)
+    counters = await get_user_counters(db, current_user.id)
+    etag = collection_etag(request, current_user.id, counters["collection_version"])
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=collection_headers(etag))
     
+    try:
+        tasks, total, next_cursor = await get_tasks_with_filters(
+            db=db,
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            search=search,
+            completed=completed,
+            category_id=category_id,
+            priority=priority,
+            due_date_from=due_date_from,
+            due_date_to=due_date_to,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            count_mode=count,
+            as_rows=as_rows,
+            fields=task_fields,
+            include_category=include_category,
+            counters=counters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if as_rows:
+        return FastJSONResponse(
+            {"tasks": tasks, "total": total, "page": skip // limit + 1, "size": limit, "next_cursor": next_cursor},
+            headers=collection_headers(etag)
+        )
+    response.headers.update(collection_headers(etag))
     return TaskListResponse(
         tasks=tasks,
         total=total,
         page=skip // limit + 1,
-        size=limit
+        size=limit,
+        next_cursor=next_cursor
     )
 
 
+@router.get("/changes", response_model=TaskChangesResponse)
+async def get_task_changes_endpoint(
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_read_session),
+    since: Optional[str] = Query(None, description="Cursor from a previous call (omit to fetch every task)"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of changed and deleted tasks to return")
+):
+    """
+    Get tasks created or updated, and tasks deleted, since a previous call.
+    
+    Keep the returned cursor and pass it as ``since`` next time; while
+    ``has_more`` is true, call again straight away. Apply ``deleted`` before
+    ``tasks``. A cursor older than the retained deletions gets 410: drop the
+    local copy and sync again without ``since``.
+    """
+    try:
+        tasks, deleted, cursor, has_more = await get_task_changes(
+            db=db, user_id=current_user.id, cursor=since, limit=limit
+        )
+    except ChangeCursorExpired:
+        raise HTTPException(status_code=410, detail="Cursor is too old, resync without since")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return TaskChangesResponse(tasks=tasks, deleted=deleted, cursor=cursor, has_more=has_more)
+
+
 @router.get("/overdue", response_model=List[TaskResponse])
 async def get_overdue_tasks_endpoint(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_read_session)
 ):
     """Get all overdue tasks (due date passed and not completed)."""
-    return get_overdue_tasks(db=db, user_id=current_user.id)
+    return await get_overdue_tasks(db=db, user_id=current_user.id)
 
 
 @router.get("/due-today", response_model=List[TaskResponse])
 async def get_tasks_due_today_endpoint(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_read_session)
 ):
     """Get all tasks due today (not completed)."""
-    return get_tasks_due_today(db=db, user_id=current_user.id)
+    return await get_tasks_due_today(db=db, user_id=current_user.id)
 
 
 @router.get("/high-priority", response_model=List[TaskResponse])
 async def get_high_priority_tasks_endpoint(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
     threshold: int = Query(7, ge=1, le=10, description="Priority threshold (1-10)")
 ):
     """Get high priority tasks (priority >= threshold)."""
-    return get_high_priority_tasks(db=db, user_id=current_user.id, priority_threshold=threshold)
+    return await get_high_priority_tasks(db=db, user_id=current_user.id, priority_threshold=threshold)
 
 
 @router.get("/completed", response_model=List[TaskResponse])
 async def get_completed_tasks_endpoint(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
     skip: int = Query(0, ge=0, description="Number of tasks to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of tasks to return")
 ):
     """Get all completed tasks."""
-    return get_completed_tasks(db=db, user_id=current_user.id, skip=skip, limit=limit)
+    return await get_completed_tasks(db=db, user_id=current_user.id, skip=skip, limit=limit)
 
 
 @router.get("/pending", response_model=List[TaskResponse])
 async def get_pending_tasks_endpoint(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
     skip: int = Query(0, ge=0, description="Number of tasks to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of tasks to return")
 ):
     """Get all pending (incomplete) tasks."""
-    return get_pending_tasks(db=db, user_id=current_user.id, skip=skip, limit=limit)
+    return await get_pending_tasks(db=db, user_id=current_user.id, skip=skip, limit=limit)
+
+
+@router.get("/statistics")
+async def get_task_statistics_endpoint(
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_read_session)
+):
+    """Get comprehensive task statistics for the current user."""
+    return await get_task_statistics(db=db, user_id=current_user.id)
+
+
+def _export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _export_rows(user_id: int, export_format: str) -> Iterator[str]:
+    """
+    Encode a user's tasks as NDJSON or CSV text, streamed in EXPORT_FLUSH_SIZE pieces.
+    
+    Uses its own read session: the request's session is closed before a
+    streamed body is produced.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == "csv" else None
+    if writer:
+        writer.writerow([column.key for column in TASK_EXPORT_COLUMNS])
+        # Send the header right away so the client sees the first byte before the query runs
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    
+    db = read_session_factory(user_id, is_async=False)()
+    try:
+        for row in stream_user_tasks(db, user_id):
+            if writer:
+                writer.writerow(["" if value is None else _export_value(value) for value in row.values()])
+            elif settings.FAST_JSON_RESPONSES:
+                buffer.write(dumps(dict(row)).decode())
+                buffer.write("\n")
+            else:
+                buffer.write(json.dumps({key: _export_value(value) for key, value in row.items()}))
+                buffer.write("\n")
+            if buffer.tell() >= EXPORT_FLUSH_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    finally:
+        db.close()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/export")
+async def export_tasks(
+    current_user: User = Depends(get_current_active_user),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="Output format (ndjson, csv)")
+):
+    """Export all of the current user's tasks as a streamed NDJSON or CSV download."""
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _export_rows(current_user.id, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{export_format}"'}
+    )
 
 
 @router.post("/", response_model=TaskResponse, status_code=201)
 async def create_task(
     task: TaskCreate, 
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
     """Create a new task."""
     # Check for duplicate title within user's tasks
-    existing_task = get_task_by_title(db, title=task.title, user_id=current_user.id)
+    existing_task = await get_task_by_title(db, title=task.title, user_id=current_user.id)
     if existing_task:
         raise HTTPException(status_code=409, detail=f"Task with title '{task.title}' already exists")
     
@@ -135,17 +343,178 @@ async def create_task(
     if task.priority and (task.priority < 1 or task.priority > 10):
         raise HTTPException(status_code=400, detail="Priority must be between 1 and 10")
     
-    return crud_create_task(db=db, task_data=task, user_id=current_user.id)
+    return await crud_create_task(db=db, task_data=task, user_id=current_user.id)
+
+
+@router.post("/batch", response_model=TaskImportResponse)
+async def create_tasks_batch(
+    rows: List[Any] = Body(..., description="Task objects, each shaped like the POST /tasks body"),
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_session)
+):
+    """Create many tasks at once; invalid rows are rejected individually."""
+    if len(rows) > MAX_TASK_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_TASK_BATCH_SIZE} tasks per batch; use POST /tasks/import for more"
+        )
+    
+    return await crud_create_tasks_batch(db=db, user_id=current_user.id, rows=enumerate(rows))
+
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Yield (line number, line) for each non-blank line of a streamed request body.
+    
+    Lines longer than MAX_IMPORT_LINE_BYTES are yielded as None and skipped.
+    """
+    buffer = b""
+    line_number = 0
+    overlong = False
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if overlong or len(line) > MAX_IMPORT_LINE_BYTES:
+                overlong = False
+                yield line_number, None
+            elif line.strip():
+                yield line_number, line
+        if len(buffer) > MAX_IMPORT_LINE_BYTES:
+            overlong, buffer = True, b""
+    if overlong or len(buffer) > MAX_IMPORT_LINE_BYTES:
+        yield line_number + 1, None
+    elif buffer.strip():
+        yield line_number + 1, buffer
+
+
+@router.post("/import", response_model=TaskImportResponse)
+async def import_tasks(
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_session)
+):
+    """
+    Import tasks from a streamed NDJSON body (one task object per line).
+    
+    Rows are validated and inserted chunk by chunk while the upload is read,
+    so memory use does not depend on the upload size.
+    """
+    report = new_import_report()
+    chunk = []
+    async for line_number, line in _ndjson_lines(request):
+        if line is None:
+            reject_import_row(report, line_number, f"Line longer than {MAX_IMPORT_LINE_BYTES} bytes")
+            continue
+        try:
+            chunk.append((line_number, json.loads(line)))
+        except ValueError:
+            reject_import_row(report, line_number, "Invalid JSON")
+            continue
+        if len(chunk) >= TASK_IMPORT_CHUNK_SIZE:
+            await import_task_chunk(db, current_user.id, chunk, report)
+            chunk = []
+    if chunk:
+        await import_task_chunk(db, current_user.id, chunk, report)
+    return report
+
+
+# Fixed paths must be declared before /{task_id} so they are not captured by it
+@router.patch("/reorder", response_model=List[TaskResponse])
+async def reorder_tasks(
+    reorder_data: dict, 
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_session)
+):
+    """Bulk reorder tasks, rewriting only the order keys of tasks that moved."""
+    task_ids = reorder_data.get("task_ids", [])
+    
+    if not task_ids:
+        raise HTTPException(status_code=400, detail="task_ids array is required")
+    
+    if not isinstance(task_ids, list) or not all(isinstance(task_id, int) for task_id in task_ids):
+        raise HTTPException(status_code=400, detail="task_ids must be an array of integers")
+    
+    try:
+        tasks = await crud_reorder_tasks(db=db, task_ids=task_ids, user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    _schedule_rebalance(background_tasks, current_user.id, tasks)
+    return tasks
+
+
+@router.patch("/bulk-update", response_model=List[TaskResponse])
+async def bulk_update_tasks(
+    bulk_update: BulkTaskUpdate, 
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_session)
+):
+    """Bulk update tasks (completion status, category, priority) in one transaction."""
+    if not bulk_update.task_ids:
+        raise HTTPException(status_code=400, detail="task_ids array is required")
+    
+    if not bulk_update.updates.model_dump(exclude_unset=True):
+        raise HTTPException(status_code=400, detail="updates object is required")
+    
+    # One key for every task would leave their relative order undefined
+    if "order_index" in bulk_update.updates.model_fields_set:
+        raise HTTPException(
+            status_code=400, detail="order_index cannot be bulk updated; use PATCH /tasks/reorder"
+        )
+    
+    try:
+        return await crud_bulk_update_tasks(
+            db=db, task_ids=bulk_update.task_ids, task_data=bulk_update.updates, user_id=current_user.id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.delete("/bulk-delete", status_code=204)
+async def bulk_delete_tasks(
+    task_ids: List[int],
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_session)
+):
+    """Bulk delete tasks in one transaction."""
+    if not task_ids:
+        raise HTTPException(status_code=400, detail="task_ids array is required")
+    
+    try:
+        await crud_bulk_delete_tasks(db=db, task_ids=task_ids, user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    return None
+
+
+@router.patch("/bulk-toggle", response_model=List[TaskResponse])
+async def bulk_toggle_tasks(
+    task_ids: List[int],
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_session)
+):
+    """Bulk toggle task completion status in one transaction."""
+    if not task_ids:
+        raise HTTPException(status_code=400, detail="task_ids array is required")
+    
+    try:
+        return await crud_bulk_toggle_tasks(db=db, task_ids=task_ids, user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int, 
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_read_session)
 ):
     """Get a specific task by ID."""
-    task = get_task_by_id(db=db, task_id=task_id, user_id=current_user.id)
+    task = await get_task_by_id(db=db, task_id=task_id, user_id=current_user.id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
@@ -155,18 +524,20 @@ async def get_task(
 async def update_task(
     task_id: int, 
     task_update: TaskUpdate, 
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
     """Update a task."""
     # Validate priority if provided
     if task_update.priority is not None and (task_update.priority < 1 or task_update.priority > 10):
         raise HTTPException(status_code=400, detail="Priority must be between 1 and 10")
     
-    updated_task = crud_update_task(db=db, task_id=task_id, task_data=task_update, user_id=current_user.id)
+    updated_task = await crud_update_task(db=db, task_id=task_id, task_data=task_update, user_id=current_user.id)
     if not updated_task:
         raise HTTPException(status_code=404, detail="Task not found")
     
+    _schedule_rebalance(background_tasks, current_user.id, [updated_task])
     return updated_task
 
 
@@ -174,10 +545,10 @@ async def update_task(
 async def delete_task(
     task_id: int, 
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
     """Delete a task."""
-    success = crud_delete_task(db=db, task_id=task_id, user_id=current_user.id)
+    success = await crud_delete_task(db=db, task_id=task_id, user_id=current_user.id)
     if not success:
         raise HTTPException(status_code=404, detail="Task not found")
     return None
@@ -187,10 +558,10 @@ async def delete_task(
 async def toggle_task(
     task_id: int, 
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
     """Toggle task completion status."""
-    task = toggle_task_completion(db=db, task_id=task_id, user_id=current_user.id)
+    task = await toggle_task_completion(db=db, task_id=task_id, user_id=current_user.id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
@@ -200,129 +571,57 @@ async def toggle_task(
 async def reorder_task(
     task_id: int, 
     reorder_data: TaskReorder, 
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
-    """Reorder a task by updating its order index."""
+    """Move a task between two neighbouring tasks."""
     if reorder_data.task_id != task_id:
         raise HTTPException(status_code=400, detail="Task ID in URL must match task ID in body")
     
-    task = crud_reorder_task(db=db, task_id=task_id, new_order_index=reorder_data.new_order_index, user_id=current_user.id)
+    try:
+        task = await crud_reorder_task(
+            db=db,
+            task_id=task_id,
+            user_id=current_user.id,
+            after_task_id=reorder_data.after_task_id,
+            before_task_id=reorder_data.before_task_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
-
-
-@router.patch("/reorder", response_model=List[TaskResponse])
-async def reorder_tasks(
-    reorder_data: dict, 
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """Bulk reorder tasks by updating their order indices."""
-    task_ids = reorder_data.get("task_ids", [])
-    
-    if not task_ids:
-        raise HTTPException(status_code=400, detail="task_ids array is required")
-    
-    if not isinstance(task_ids, list):
-        raise HTTPException(status_code=400, detail="task_ids must be an array")
-    
-    # Update order indices for all tasks
-    updated_tasks = []
-    for index, task_id in enumerate(task_ids):
-        # Calculate new order index (spaced out for future insertions)
-        new_order_index = (index + 1) * 1000.0
-        
-        task = crud_reorder_task(db=db, task_id=task_id, new_order_index=new_order_index, user_id=current_user.id)
-        if task:
-            updated_tasks.append(task)
-        else:
-            # If any task is not found, rollback and return error
-            raise HTTPException(status_code=404, detail=f"Task with ID {task_id} not found")
-    
-    return updated_tasks
-
-
-@router.patch("/bulk-update", response_model=List[TaskResponse])
-async def bulk_update_tasks(
-    bulk_update: BulkTaskUpdate, 
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """Bulk update tasks (completion status, category, priority)."""
-    if not bulk_update.task_ids:
-        raise HTTPException(status_code=400, detail="task_ids array is required")
     
-    if not bulk_update.updates:
-        raise HTTPException(status_code=400, detail="updates object is required")
-    
-    updated_tasks = []
-    for task_id in bulk_update.task_ids:
-        task = crud_update_task(db=db, task_id=task_id, task_data=bulk_update.updates, user_id=current_user.id)
-        if task:
-            updated_tasks.append(task)
-        else:
-            raise HTTPException(status_code=404, detail=f"Task with ID {task_id} not found")
-    
-    return updated_tasks
-
-
-@router.delete("/bulk-delete", status_code=204)
-async def bulk_delete_tasks(task_ids: List[int], db: Session = Depends(get_db)):
-    """Bulk delete tasks."""
-    if not task_ids:
-        raise HTTPException(status_code=400, detail="task_ids array is required")
-    
-    failed_deletions = []
-    for task_id in task_ids:
-        success = crud_delete_task(db=db, task_id=task_id)
-        if not success:
-            failed_deletions.append(task_id)
-    
-    if failed_deletions:
-        raise HTTPException(
-            status_code=404, 
-            detail=f"Failed to delete tasks with IDs: {failed_deletions}"
-        )
-    
-    return None
-
-
-@router.patch("/bulk-toggle", response_model=List[TaskResponse])
-async def bulk_toggle_tasks(task_ids: List[int], db: Session = Depends(get_db)):
-    """Bulk toggle task completion status."""
-    if not task_ids:
-        raise HTTPException(status_code=400, detail="task_ids array is required")
-    
-    updated_tasks = []
-    for task_id in task_ids:
-        task = toggle_task_completion(db=db, task_id=task_id)
-        if task:
-            updated_tasks.append(task)
-        else:
-            raise HTTPException(status_code=404, detail=f"Task with ID {task_id} not found")
-    
-    return updated_tasks
+    _schedule_rebalance(background_tasks, current_user.id, [task])
+    return task
 
 
 @router.get("/search/full-text", response_model=List[TaskResponse])
 async def search_tasks_full_text_endpoint(
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_read_session),
     query: str = Query(..., description="Search query"),
     skip: int = Query(0, ge=0, description="Number of tasks to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Number of tasks to return")
+    limit: int = Query(100, ge=1, le=1000, description="Number of tasks to return"),
+    fields: Optional[str] = _FIELDS_QUERY,
+    include: Optional[str] = _INCLUDE_QUERY
 ):
-    """Full-text search across task titles and descriptions."""
+    """Full-text search across task titles and descriptions, ranked by relevance."""
     if not query.strip():
         raise HTTPException(status_code=400, detail="Search query cannot be empty")
     
-    return search_tasks_full_text(db=db, search_query=query, skip=skip, limit=limit)
+    task_fields, include_category, as_rows = _task_shape(fields, include)
+    tasks = await search_tasks_full_text(
+        db=db, user_id=current_user.id, search_query=query, skip=skip, limit=limit,
+        as_rows=as_rows, fields=task_fields, include_category=include_category
+    )
+    return FastJSONResponse(tasks) if as_rows else tasks
 
 
 @router.get("/search/advanced", response_model=List[TaskResponse])
 async def search_tasks_advanced_endpoint(
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_read_session),
     query: Optional[str] = Query(None, description="Text search query"),
     priority_min: Optional[int] = Query(None, ge=1, le=10, description="Minimum priority"),
     priority_max: Optional[int] = Query(None, ge=1, le=10, description="Maximum priority"),
@@ -331,9 +630,13 @@ async def search_tasks_advanced_endpoint(
     due_date_to: Optional[str] = Query(None, description="Due date to (YYYY-MM-DD)"),
     completed: Optional[bool] = Query(None, description="Completion status filter"),
     skip: int = Query(0, ge=0, description="Number of tasks to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Number of tasks to return")
+    limit: int = Query(100, ge=1, le=1000, description="Number of tasks to return"),
+    fields: Optional[str] = _FIELDS_QUERY,
+    include: Optional[str] = _INCLUDE_QUERY
 ):
     """Advanced search with multiple criteria simultaneously."""
+    task_fields, include_category, as_rows = _task_shape(fields, include)
+    
     # Parse category IDs
     category_id_list = None
     if category_ids:
@@ -362,20 +665,18 @@ async def search_tasks_advanced_endpoint(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
-    return search_tasks_by_multiple_criteria(
+    tasks = await search_tasks_by_multiple_criteria(
         db=db,
+        user_id=current_user.id,
         search_query=query,
         priority_range=priority_range,
         category_ids=category_id_list,
         due_date_range=due_date_range,
         completion_status=completed,
         skip=skip,
-        limit=limit
+        limit=limit,
+        as_rows=as_rows,
+        fields=task_fields,
+        include_category=include_category
     )
-
-
-@router.get("/statistics")
-async def get_task_statistics_endpoint(db: Session = Depends(get_db)):
-    """Get comprehensive task statistics."""
-    return get_task_statistics(db=db)
-
+    return FastJSONResponse(tasks) if as_rows else tasks
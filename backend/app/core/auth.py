@@ -1,19 +1,39 @@
 """
 Authentication utilities.
 """
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import DBSession, get_session, read_session, run_db
 from app.models.user import User
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing; a hash with any other cost than BCRYPT_ROUNDS counts as
+# outdated, so changing the setting upgrades (or downgrades) hashes at login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt costs hundreds of milliseconds of CPU per call: the route handlers run it
+# on these threads, never on the event loop or the database threadpool, and shed
+# load with a 503 once PASSWORD_HASH_MAX_PENDING jobs are running or queued
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_pending_password_jobs = 0  # Only changed from the event loop
 
 # JWT token security
 security = HTTPBearer()
@@ -23,6 +43,13 @@ SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Authenticated users by token subject, detached from the session that loaded
+# them, so a cache hit costs get_current_user no query and no connection checkout
+_user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+# Verified claims by SHA-256 digest of the token, each kept until the token's exp
+_claims_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -34,6 +61,37 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashingBusy(Exception):
+    """Raised when too many password hash jobs are already running or queued."""
+
+
+async def _run_password_job(function, *args):
+    global _pending_password_jobs
+    if _pending_password_jobs >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHashingBusy("Too many password operations in progress")
+    _pending_password_jobs += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, function, *args)
+    finally:
+        _pending_password_jobs -= 1
+
+
+async def hash_password(password: str) -> str:
+    """get_password_hash on the password executor; raises PasswordHashingBusy when it is full."""
+    return await _run_password_job(get_password_hash, password)
+
+
+async def check_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password on the password executor.
+    
+    Returns (valid, new_hash): new_hash is a rehash with the current
+    BCRYPT_ROUNDS when the password is valid but its hash is outdated, else
+    None. Raises PasswordHashingBusy when the executor is full.
+    """
+    return await _run_password_job(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -48,17 +106,53 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def verify_token(token: str) -> Optional[dict]:
-    """Verify and decode a JWT token."""
+    """
+    Verify and decode a JWT token.
+    
+    Claims of a valid token are cached until it expires, so a client that
+    repeats its bearer token pays for the signature check once. Invalid tokens
+    are not cached. The returned dict is shared with the cache; do not modify it.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _claims_cache.get(key)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and exp > time.time():
+        _claims_cache.set(key, payload, ttl=exp - time.time())
+    return payload
+
+
+def _get_user(db: Session, user_id) -> Optional[User]:
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is not None:
+        # Detach it: a commit later in the request must not expire the cached copy
+        db.expunge(user)
+    return user
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop a user from the authenticated-user cache; called after the user row changes."""
+    _user_cache.invalidate(str(user_id))
+
+
+def user_cache_stats() -> dict:
+    """Hit/miss counters and size of the authenticated-user cache."""
+    return _user_cache.stats()
+
+
+def token_cache_stats() -> dict:
+    """Hit/miss counters and size of the verified-token claims cache."""
+    return _claims_cache.stats()
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ) -> User:
     """Get the current authenticated user."""
     credentials_exception = HTTPException(
@@ -79,13 +173,29 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = _user_cache.get(str(user_id))
     if user is None:
-        raise credentials_exception
+        user = await run_db(db, _get_user, user_id)
+        if user is None:
+            raise credentials_exception
+        _user_cache.set(str(user_id), user)
     
+    # Writes through this session count as the user's for read-your-writes
+    db.info["user_id"] = user.id
     return user
 
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """Get the current active user."""
     return current_user
+
+
+async def get_read_session(current_user: User = Depends(get_current_user)):
+    """
+    Read-only session dependency for GET routes.
+    
+    Bound to the replica (DATABASE_READ_URL) unless the user wrote within the
+    last READ_YOUR_WRITES_SECONDS, in which case it reads from the primary.
+    """
+    async for db in read_session(current_user.id):
+        yield db
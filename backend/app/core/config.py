@@ -11,6 +11,37 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./todo_app.db"
+    DATABASE_ASYNC: bool = False  # Serve requests through an AsyncSession (aiosqlite / asyncpg)
+    ASYNC_DATABASE_URL: str = ""  # Defaults to DATABASE_URL with the matching async driver
+    DATABASE_ECHO: bool = False  # Log every SQL statement; independent of DEBUG
+    
+    # Read replica (GET endpoints)
+    DATABASE_READ_URL: str = ""  # Replica for read-only sessions; empty reads from DATABASE_URL
+    ASYNC_DATABASE_READ_URL: str = ""  # Defaults to DATABASE_READ_URL with the matching async driver
+    READ_YOUR_WRITES_SECONDS: float = 5.0  # After a write, the user's reads stay on the primary this long
+    
+    # Connection pool (server databases; per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # Wait for a free connection before failing
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Replace connections older than this
+    DB_POOL_PING_IDLE_SECONDS: float = 60.0  # Ping connections idle longer than this on checkout
+    
+    # SQLite connection profile (applied on connect when DATABASE_URL is SQLite)
+    SQLITE_PROFILE: bool = True  # WAL, the pragmas below and an in-process writer queue
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # Durable at checkpoints, no fsync per commit in WAL mode
+    SQLITE_CACHE_SIZE_KIB: int = 65536  # Page cache per connection
+    SQLITE_MMAP_SIZE_BYTES: int = 268435456  # Memory-mapped I/O; 0 disables
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait this long for a lock held by another process
+    
+    # PostgreSQL session options
+    DB_APPLICATION_NAME: str = "todo-api"
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 disables the timeout
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # Existing hashes with another cost are rehashed at login
+    PASSWORD_HASH_WORKERS: int = 2  # Threads hashing/verifying passwords; bcrypt releases the GIL
+    PASSWORD_HASH_MAX_PENDING: int = 32  # Running plus queued hash jobs before requests get 503
     
     # Application
     SECRET_KEY: str = "your-secret-key-here"
@@ -20,6 +51,42 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000,http://127.0.0.1:3000"
     
+    # Caching
+    STATISTICS_CACHE_TTL_SECONDS: float = 30.0
+    USER_CACHE_TTL_SECONDS: float = 60.0  # How long another worker may keep serving a changed/deleted user
+    USER_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_SIZE: int = 10000  # Verified JWT claims, each kept until the token expires
+    CATEGORY_CACHE_TTL_SECONDS: float = 300.0  # Entries are also checked against the user's collection version
+    CATEGORY_CACHE_SIZE: int = 10000
+    
+    # Responses
+    FAST_JSON_RESPONSES: bool = False  # Task list/search/export: plain rows encoded with orjson, no ORM or re-validation
+    
+    # Ordering
+    ORDER_KEY_REBALANCE_LENGTH: int = 32  # Rebalance a user's order keys once one grows longer
+    
+    # Delta sync
+    TASK_TOMBSTONE_RETENTION_DAYS: int = 30  # prune_task_tombstones.py drops older deletions; older cursors must resync
+    
+    @staticmethod
+    def _with_async_driver(url: str) -> str:
+        scheme, _, rest = url.partition("://")
+        dialect = scheme.split("+")[0]
+        driver = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}.get(dialect)
+        return f"{dialect}+{driver}://{rest}" if driver else url
+    
+    @property
+    def async_database_url(self) -> str:
+        """DATABASE_URL with its driver swapped for the asyncio one, unless set explicitly."""
+        return self.ASYNC_DATABASE_URL or self._with_async_driver(self.DATABASE_URL)
+    
+    @property
+    def async_database_read_url(self) -> str:
+        """DATABASE_READ_URL with its driver swapped for the asyncio one, unless set explicitly."""
+        if self.ASYNC_DATABASE_READ_URL or not self.DATABASE_READ_URL:
+            return self.ASYNC_DATABASE_READ_URL
+        return self._with_async_driver(self.DATABASE_READ_URL)
+    
     @property
     def allowed_hosts_list(self) -> List[str]:
         """Convert ALLOWED_HOSTS string to list."""
@@ -1,24 +1,147 @@
 """
 Database configuration and session management.
 """
-from sqlalchemy import create_engine
+import asyncio
+import functools
+import time
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Union
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from .config import settings
+from .pool import MeteredAsyncAdaptedQueuePool, MeteredQueuePool, install_idle_liveness_check
+from .sqlite import install_sqlite_profile
+
+
+def _engine_options(url: str, is_async: bool) -> dict:
+    """create_engine keyword arguments for url, built from the pool and session settings."""
+    options = {"echo": settings.DATABASE_ECHO}
+    parsed = make_url(url)
+    backend, driver = parsed.get_backend_name(), parsed.get_driver_name()
+    if backend == "sqlite":
+        # SQLite connections are local files; pool sizing and liveness checks do not apply
+        return options
+    
+    options.update(
+        poolclass=MeteredAsyncAdaptedQueuePool if is_async else MeteredQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+    if backend == "postgresql":
+        server_settings = {"application_name": settings.DB_APPLICATION_NAME}
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if driver == "asyncpg":
+            options["connect_args"] = {"server_settings": server_settings}
+        else:
+            # libpq takes the application name directly and other settings as -c options
+            options["connect_args"] = {"application_name": server_settings.pop("application_name")}
+            if server_settings:
+                options["connect_args"]["options"] = " ".join(
+                    f"-c {name}={value}" for name, value in server_settings.items()
+                )
+    return options
+
+
+def _create_engine(url: str, is_async: bool = False):
+    engine = (create_async_engine if is_async else create_engine)(url, **_engine_options(url, is_async))
+    sync_engine = engine.sync_engine if is_async else engine
+    if make_url(url).get_backend_name() != "sqlite":
+        install_idle_liveness_check(sync_engine, settings.DB_POOL_PING_IDLE_SECONDS)
+    elif settings.SQLITE_PROFILE:
+        install_sqlite_profile(sync_engine)
+    return engine
+
 
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=settings.DEBUG
-)
+engine = _create_engine(settings.DATABASE_URL)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory, used by the API when DATABASE_ASYNC is set.
+# Objects must stay readable after commit, since lazy loads cannot run outside
+# of AsyncSession.run_sync (see app.crud.aio)
+async_engine = _create_engine(settings.async_database_url, is_async=True) if settings.DATABASE_ASYNC else None
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+) if settings.DATABASE_ASYNC else None
+
+
+class ReadOnlySession(Session):
+    """
+    Session of the read-only factories; writing through it raises.
+    
+    Flushes, INSERT/UPDATE/DELETE statements and commits are all refused, so
+    a write that reaches a read path fails in development rather than on a
+    read-only replica (or, on SQLite, outside the writer queue).
+    """
+
+
+def _refuse_write(*args, **kwargs):
+    raise InvalidRequestError("Read-only session: writes must use the primary session")
+
+
+event.listen(ReadOnlySession, "before_flush", _refuse_write)
+event.listen(ReadOnlySession, "before_commit", _refuse_write)
+
+
+@event.listens_for(ReadOnlySession, "do_orm_execute")
+def _refuse_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _refuse_write()
+
+
+# Read-only sessions for the GET endpoints, bound to the replica when
+# DATABASE_READ_URL is set and to the primary otherwise
+read_engine = _create_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine, class_=ReadOnlySession)
+async_read_engine = (
+    _create_engine(settings.async_database_read_url, is_async=True)
+    if settings.DATABASE_ASYNC and settings.async_database_read_url else async_engine
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    async_read_engine, autoflush=False, expire_on_commit=False, sync_session_class=ReadOnlySession
+) if settings.DATABASE_ASYNC else None
+
+# Read-your-writes: a user who wrote reads from the primary until the replica has
+# caught up, i.e. for READ_YOUR_WRITES_SECONDS. Tracked per worker process, like
+# the other in-process caches, so it relies on a user's requests reaching the same
+# worker (or on replica lag staying below a request round trip) across workers
+_has_replica = read_engine is not engine or async_read_engine is not async_engine
+_primary_reads_until: Dict[int, float] = {}
+_PRIMARY_READS_PRUNE_SIZE = 10000
+
+# SQLite takes one writer at a time: queue this process's writes (FIFO) instead of
+# letting them contend for the lock, while reads keep running alongside under WAL.
+# Sync sessions write on one dedicated thread, so queued writes never wait behind
+# reads for a threadpool slot; async sessions take turns on a lock
+_sqlite_queue_writes = settings.SQLITE_PROFILE and engine.dialect.name == "sqlite"
+_sqlite_writer_thread = (
+    ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer") if _sqlite_queue_writes else None
+)
+_sqlite_writer_lock = asyncio.Lock() if _sqlite_queue_writes else None
+
+# What route handlers receive from get_session
+DBSession = Union[Session, AsyncSession]
+
 # Create base class for models
 Base = declarative_base()
 
+# Relationships the response schemas read, by model name; loaded before a result
+# leaves run_db, since a lazy load afterwards would need the session again
+_RESPONSE_RELATIONSHIPS = {
+    "Task": ("category",),
+}
+
 
 def get_db():
     """Dependency to get database session."""
@@ -28,3 +151,132 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    """Dependency to get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Session dependency of the API routes; use it with the awaitable CRUD functions in app.crud.aio
+get_session = get_async_db if settings.DATABASE_ASYNC else get_db
+
+
+@asynccontextmanager
+async def background_session(user_id: int):
+    """
+    Primary session for a user's work outside a request, e.g. a background task.
+    
+    Tagged with the user as get_current_user tags request sessions, so writes
+    through run_db_write are recorded for read-your-writes. Use it with the
+    app.crud.aio functions, like a get_session session.
+    """
+    if settings.DATABASE_ASYNC:
+        async with AsyncSessionLocal() as db:
+            db.info["user_id"] = user_id
+            yield db
+        return
+    db = SessionLocal()
+    db.info["user_id"] = user_id
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
+
+
+def record_user_write(user_id: Optional[int]) -> None:
+    """Send the user's reads to the primary for the next READ_YOUR_WRITES_SECONDS."""
+    if user_id is None or not _has_replica:
+        return
+    now = time.monotonic()
+    if len(_primary_reads_until) >= _PRIMARY_READS_PRUNE_SIZE:
+        for expired in [key for key, until in _primary_reads_until.items() if until <= now]:
+            del _primary_reads_until[expired]
+    _primary_reads_until[user_id] = now + settings.READ_YOUR_WRITES_SECONDS
+
+
+def read_session_factory(user_id: int, is_async: bool = settings.DATABASE_ASYNC):
+    """Session factory for a user's reads: the replica, or the primary right after they wrote."""
+    if _primary_reads_until.get(user_id, 0.0) > time.monotonic():
+        return AsyncSessionLocal if is_async else SessionLocal
+    return AsyncReadSessionLocal if is_async else ReadSessionLocal
+
+
+async def read_session(user_id: int):
+    """
+    Yield a read session for the user; the body of the read session dependency.
+    
+    The session is closed in the threadpool, as get_db's teardown would be.
+    """
+    if settings.DATABASE_ASYNC:
+        async with read_session_factory(user_id)() as db:
+            yield db
+        return
+    db = read_session_factory(user_id)()
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
+
+
+def _load_response_relationships(value) -> None:
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            _load_response_relationships(item)
+        return
+    keys = _RESPONSE_RELATIONSHIPS.get(type(value).__name__, ())
+    if keys and inspect(value).session is not None:
+        for key in keys:
+            getattr(value, key)
+
+
+def _call(db: Session, function, args, kwargs):
+    result = function(db, *args, **kwargs)
+    _load_response_relationships(result)
+    return result
+
+
+async def run_db(db: DBSession, function, *args, **kwargs):
+    """
+    Call function(session, *args, **kwargs) without blocking the event loop.
+    
+    With an AsyncSession the call runs through AsyncSession.run_sync, so its
+    queries go through the asyncio driver; a plain Session is used from the
+    threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(_call, function, args, kwargs)
+    return await run_in_threadpool(_call, db, function, args, kwargs)
+
+
+async def run_db_write(db: DBSession, function, *args, **kwargs):
+    """
+    run_db for functions that write; on SQLite they wait their turn in the writer queue.
+    
+    Afterwards the session's user (db.info["user_id"], set by get_current_user)
+    reads from the primary for a while; see record_user_write.
+    """
+    try:
+        if not _sqlite_queue_writes:
+            return await run_db(db, function, *args, **kwargs)
+        if isinstance(db, AsyncSession):
+            async with _sqlite_writer_lock:
+                return await run_db(db, function, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(
+            _sqlite_writer_thread, functools.partial(_call, db, function, args, kwargs)
+        )
+    finally:
+        record_user_write(db.info.get("user_id"))
+
+
+def pool_stats() -> dict:
+    """Occupancy and checkout metrics of the engines' connection pools, by engine."""
+    engines = {"sync": engine, "async": async_engine}
+    if read_engine is not engine:
+        engines["read"] = read_engine
+    if async_read_engine is not async_engine:
+        engines["async_read"] = async_read_engine
+    return {
+        name: pooled.pool.stats() for name, pooled in engines.items()
+        if pooled is not None and hasattr(pooled.pool, "stats")
+    }
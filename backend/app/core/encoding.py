@@ -0,0 +1,28 @@
+"""
+Fast JSON encoding for the opt-in plain-row response path (FAST_JSON_RESPONSES).
+
+Rows from the CRUD functions' ``as_rows`` mode are encoded straight to bytes
+with orjson instead of being validated into response models and encoded by
+FastAPI. The output matches the response models' JSON: same keys and order,
+ISO 8601 datetimes with "Z" for UTC.
+"""
+from typing import Any, Optional
+import orjson
+from fastapi.responses import Response
+
+
+def dumps(value: Any) -> bytes:
+    """Encode value as JSON bytes."""
+    return orjson.dumps(value, option=orjson.OPT_UTC_Z)
+
+
+class FastJSONResponse(Response):
+    """JSON response whose content is encoded with orjson, without response model validation."""
+    
+    media_type = "application/json"
+    
+    def __init__(self, content: Any, status_code: int = 200, headers: Optional[dict] = None):
+        super().__init__(content, status_code=status_code, headers=headers)
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,31 @@
+"""
+Strong ETags for per-user collections.
+
+A collection's representation is fully determined by the user, the request
+URL (path and query string) and the user's collection version, which every
+task and category write bumps. The ETag is a digest of those three, so it can
+be computed, and a conditional GET answered, before any list query runs.
+"""
+import hashlib
+from fastapi import Request
+
+
+def collection_etag(request: Request, user_id: int, version: int) -> str:
+    """Strong ETag for the collection at request's URL, as seen by user_id at version."""
+    key = f"{user_id}:{version}:{request.url.path}?{request.url.query}"
+    return '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header names etag (weak comparison, as RFC 9110 requires)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def collection_headers(etag: str) -> dict:
+    """Response headers of a collection: its ETag, and revalidation on every use by private caches only."""
+    return {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
@@ -0,0 +1,229 @@
+"""
+Fractional-index order keys for manually ordered lists.
+
+An order key is a base-62 string that sorts byte-wise ("C" collation). A new
+key can always be generated between any two existing keys, so moving a task
+only rewrites that task's key. Keys consist of an integer part, whose first
+character encodes its length ('a'-'z' for non-negative, 'A'-'Z' for negative
+integers), followed by an optional fractional part without trailing zeros.
+Appending after the last key increments the integer part, so keys only grow
+logarithmically for append-heavy lists; repeated inserts between the same two
+neighbours grow the fractional part, which is what rebalancing resets.
+"""
+from typing import Dict, List, Optional
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Key of the first item of an empty list
+FIRST_KEY = "a" + DIGITS[0]
+
+# Smallest possible integer part; nothing can be generated before a bare one
+_SMALLEST_INTEGER = "A" + DIGITS[0] * 26
+
+
+def _integer_length(head: str) -> int:
+    if "a" <= head <= "z":
+        return ord(head) - ord("a") + 2
+    if "A" <= head <= "Z":
+        return ord("Z") - ord(head) + 2
+    raise ValueError(f"Invalid order key head: {head!r}")
+
+
+def _integer_part(key: str) -> str:
+    length = _integer_length(key[0])
+    if length > len(key):
+        raise ValueError(f"Invalid order key: {key!r}")
+    return key[:length]
+
+
+def validate_order_key(key: str) -> str:
+    """Return key unchanged if it is a well-formed order key, else raise ValueError."""
+    if not key or key == _SMALLEST_INTEGER:
+        raise ValueError(f"Invalid order key: {key!r}")
+    integer = _integer_part(key)
+    if any(char not in DIGITS for char in key[1:]):
+        raise ValueError(f"Invalid order key: {key!r}")
+    if len(key) > len(integer) and key.endswith(DIGITS[0]):
+        raise ValueError(f"Invalid order key: {key!r}")
+    return key
+
+
+def _increment_integer(integer: str) -> Optional[str]:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        value = DIGITS.index(digits[i]) + 1
+        if value < BASE:
+            digits[i] = DIGITS[value]
+            return head + "".join(digits)
+        digits[i] = DIGITS[0]
+    # Carried out of the last digit: move to the next integer length
+    if head == "Z":
+        return "a" + DIGITS[0]
+    if head == "z":
+        return None
+    head = chr(ord(head) + 1)
+    if head > "a":
+        digits.append(DIGITS[0])
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def _decrement_integer(integer: str) -> Optional[str]:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        value = DIGITS.index(digits[i]) - 1
+        if value >= 0:
+            digits[i] = DIGITS[value]
+            return head + "".join(digits)
+        digits[i] = DIGITS[-1]
+    if head == "a":
+        return "Z" + DIGITS[-1]
+    if head == "A":
+        return None
+    head = chr(ord(head) - 1)
+    if head < "Z":
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def _midpoint(low: str, high: Optional[str]) -> str:
+    """Fractional digits strictly between low and high (None meaning 1)."""
+    if high is not None:
+        # Skip the common prefix, treating missing digits of low as zeros
+        n = 0
+        while n < len(high) and (low[n] if n < len(low) else DIGITS[0]) == high[n]:
+            n += 1
+        if n > 0:
+            return high[:n] + _midpoint(low[n:], high[n:])
+    low_digit = DIGITS.index(low[0]) if low else 0
+    high_digit = DIGITS.index(high[0]) if high is not None else BASE
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit + 1) // 2]
+    if high is not None and len(high) > 1:
+        return high[:1]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def generate_key_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    Return an order key that sorts strictly between before and after.
+
+    Either bound may be None, meaning the start or end of the list.
+
+    Raises:
+        ValueError: If a key is malformed or before does not sort before after
+    """
+    if before is not None:
+        validate_order_key(before)
+    if after is not None:
+        validate_order_key(after)
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"Order key {before!r} does not sort before {after!r}")
+
+    if before is None:
+        if after is None:
+            return FIRST_KEY
+        integer = _integer_part(after)
+        if integer == _SMALLEST_INTEGER:
+            return integer + _midpoint("", after[len(integer):])
+        if integer < after:
+            return integer
+        decremented = _decrement_integer(integer)
+        if decremented is None:
+            raise ValueError("Cannot generate an order key before the smallest key")
+        return decremented
+
+    integer = _integer_part(before)
+    fraction = before[len(integer):]
+    if after is None:
+        incremented = _increment_integer(integer)
+        return integer + _midpoint(fraction, None) if incremented is None else incremented
+
+    after_integer = _integer_part(after)
+    if integer == after_integer:
+        return integer + _midpoint(fraction, after[len(after_integer):])
+    incremented = _increment_integer(integer)
+    if incremented is not None and incremented < after:
+        return incremented
+    return integer + _midpoint(fraction, None)
+
+
+def generate_n_keys_between(before: Optional[str], after: Optional[str], n: int) -> List[str]:
+    """Return n ascending order keys strictly between before and after, spread evenly."""
+    if n <= 0:
+        return []
+    if n == 1:
+        return [generate_key_between(before, after)]
+    if after is None:
+        keys = [generate_key_between(before, None)]
+        while len(keys) < n:
+            keys.append(generate_key_between(keys[-1], None))
+        return keys
+    if before is None:
+        keys = [generate_key_between(None, after)]
+        while len(keys) < n:
+            keys.append(generate_key_between(None, keys[-1]))
+        return keys[::-1]
+    middle = n // 2
+    key = generate_key_between(before, after)
+    return (
+        generate_n_keys_between(before, key, middle)
+        + [key]
+        + generate_n_keys_between(key, after, n - middle - 1)
+    )
+
+
+def plan_reorder(keys: List[Optional[str]]) -> Dict[int, str]:
+    """
+    Work out the fewest key changes that make keys ascend in the given order.
+
+    keys holds the current key of each item in its new position. Items on a
+    longest strictly ascending run keep their keys; every other item gets a new
+    key between its kept neighbours. Moving one item in a list therefore changes
+    exactly one key.
+
+    Returns:
+        New keys by position, for the positions whose key has to change
+    """
+    # Longest strictly increasing subsequence (patience sorting), by position
+    tails: List[int] = []
+    previous: List[Optional[int]] = [None] * len(keys)
+    for position, key in enumerate(keys):
+        if key is None:
+            continue
+        low, high = 0, len(tails)
+        while low < high:
+            mid = (low + high) // 2
+            if keys[tails[mid]] < key:
+                low = mid + 1
+            else:
+                high = mid
+        previous[position] = tails[low - 1] if low else None
+        if low == len(tails):
+            tails.append(position)
+        else:
+            tails[low] = position
+
+    kept = set()
+    position = tails[-1] if tails else None
+    while position is not None:
+        kept.add(position)
+        position = previous[position]
+
+    changes: Dict[int, str] = {}
+    run: List[int] = []
+    before = None
+    for position in range(len(keys) + 1):
+        if position < len(keys) and position not in kept:
+            run.append(position)
+            continue
+        after = keys[position] if position < len(keys) else None
+        for moved, key in zip(run, generate_n_keys_between(before, after, len(run))):
+            changes[moved] = key
+        run = []
+        before = after
+    return changes
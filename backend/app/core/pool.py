@@ -0,0 +1,116 @@
+"""
+Connection pool instrumentation and liveness checks.
+
+The metered pools record how often connections are checked out and how long
+callers wait for one, which is what pool_size / max_overflow should be sized
+from: sustained waits or timeouts mean the pool is too small for the worker's
+concurrency, a high-water mark well below pool_size means it is too large.
+"""
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Thread-safe counters describing checkouts from one connection pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.checked_out_max = 0
+        self.liveness_failures = 0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait_seconds: float, checked_out: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+            self.checked_out_max = max(self.checked_out_max, checked_out)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_liveness_failure(self) -> None:
+        with self._lock:
+            self.liveness_failures += 1
+
+    def stats(self) -> dict:
+        """Return the counters as a dict, with the average checkout wait."""
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(1000 * self.wait_seconds_total / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_ms_max": round(1000 * self.wait_seconds_max, 3),
+                "checked_out_max": self.checked_out_max,
+                "liveness_failures": self.liveness_failures,
+            }
+
+
+class _MeteredPoolMixin:
+    """Times every checkout of a QueuePool, including waits for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start, self.checkedout())
+        return record
+
+    def stats(self) -> dict:
+        """Current pool occupancy plus the checkout metrics."""
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "idle": self.checkedin(),
+            **self.metrics.stats(),
+        }
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncAdaptedQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def install_idle_liveness_check(engine: Engine, idle_seconds: float) -> None:
+    """
+    Ping a pooled connection on checkout only if it sat idle for idle_seconds.
+
+    pool_pre_ping costs a round trip on every checkout; connections that were
+    just returned are almost always alive, and one that died while busy is
+    invalidated by SQLAlchemy's disconnect handling anyway. A failed ping makes
+    the pool discard the connection and hand out a fresh one.
+    """
+    @event.listens_for(engine, "checkin")
+    def _remember_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            metrics = getattr(engine.pool, "metrics", None)
+            if metrics is not None:
+                metrics.record_liveness_failure()
+            raise exc.DisconnectionError("Idle connection failed its liveness check") from e
@@ -0,0 +1,89 @@
+"""
+Text search over tasks and categories.
+
+Full-text search uses the FTS5 index on SQLite and the generated tsvector
+column with its GIN index on PostgreSQL. Substring search (the ``search``
+filter of list endpoints) uses FTS5 trigram tables on SQLite and pg_trgm GIN
+indexes on PostgreSQL. All of them are created with their tables, see
+app.models.task and app.models.category. Other databases fall back to ILIKE.
+"""
+import re
+from typing import List
+from sqlalchemy import Integer, and_, or_, func, desc, asc, literal_column, table, column, select
+from sqlalchemy.orm import Session
+from app.models.task import Task
+
+# FTS5 external-content table mirroring tasks(title, description)
+tasks_fts = table("tasks_fts", column("rowid", Integer))
+
+# Generated tsvector column on PostgreSQL; deliberately not mapped on the model
+search_vector = literal_column("tasks.search_vector")
+
+# Letters and digits only - the same characters the FTS tokenizers keep
+_WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def tokenize(text: str, min_length: int = 1) -> List[str]:
+    """Split free text into search words, dropping punctuation and short words."""
+    return [word.lower() for word in _WORD_RE.findall(text) if len(word) >= min_length]
+
+
+def apply_text_search(db: Session, stmt, words: List[str], match_all: bool = False):
+    """
+    Restrict a select over Task to rows matching the given words and rank them by relevance.
+    
+    Words are matched as prefixes, so "rep" finds "report". With ``match_all``
+    every word must match; otherwise any word is enough.
+    """
+    dialect = db.get_bind().dialect.name
+    
+    if dialect == "sqlite":
+        joiner = " AND " if match_all else " OR "
+        # Words contain only letters and digits, so quoting them is a complete escape
+        match_query = joiner.join(f'"{word}"*' for word in words)
+        return (
+            stmt.join(tasks_fts, tasks_fts.c.rowid == Task.id)
+            .where(literal_column("tasks_fts").op("MATCH")(match_query))
+            # bm25() is lower for better matches
+            .order_by(asc(func.bm25(literal_column("tasks_fts"), 2.0, 1.0)))
+        )
+    
+    if dialect == "postgresql":
+        joiner = " & " if match_all else " | "
+        ts_query = func.to_tsquery("simple", joiner.join(f"{word}:*" for word in words))
+        return (
+            stmt.where(search_vector.op("@@")(ts_query))
+            .order_by(desc(func.ts_rank(search_vector, ts_query)))
+        )
+    
+    conditions = [
+        or_(Task.title.ilike(f"%{word}%"), Task.description.ilike(f"%{word}%"))
+        for word in words
+    ]
+    return stmt.where(and_(*conditions) if match_all else or_(*conditions))
+
+
+# Trigrams need at least three characters; shorter terms fall back to a scan
+MIN_TRIGRAM_LENGTH = 3
+
+
+def substring_condition(db: Session, model, columns: list, term: str):
+    """
+    Build a case-insensitive "any of ``columns`` contains ``term``" predicate for ``model``.
+    
+    On SQLite the match runs against the model's FTS5 trigram mirror
+    (``<table>_trgm``); on PostgreSQL the plain ILIKE is served by the pg_trgm
+    GIN indexes.
+    """
+    if db.get_bind().dialect.name == "sqlite" and len(term) >= MIN_TRIGRAM_LENGTH:
+        trigram_name = f"{model.__tablename__}_trgm"
+        trigram_table = table(trigram_name, column("rowid", Integer))
+        # A quoted FTS5 string is a phrase of consecutive trigrams, i.e. a substring
+        phrase = '"' + term.replace('"', '""') + '"'
+        matching_ids = select(trigram_table.c.rowid).where(
+            literal_column(trigram_name).op("MATCH")(phrase)
+        )
+        return model.id.in_(matching_ids)
+    
+    search_term = f"%{term}%"
+    return or_(*(col.ilike(search_term) for col in columns))
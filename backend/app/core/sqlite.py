@@ -0,0 +1,42 @@
+"""
+SQLite connection profile for serving concurrent requests.
+
+WAL lets readers run while a write is in progress, synchronous=NORMAL drops the
+fsync from every commit (WAL stays consistent; only the last transactions
+before a power loss can be lost), and busy_timeout makes a connection wait for
+a lock held by another process instead of failing with "database is locked".
+SQLite still allows a single writer at a time, so within a process writes are
+queued (see app.core.database.run_db_write) rather than left to spin on the
+busy handler.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+
+def sqlite_pragmas() -> dict:
+    """PRAGMA values applied to every new connection, in order."""
+    return {
+        "journal_mode": "WAL",
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        # Negative cache_size is in KiB rather than pages
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KIB,
+        "mmap_size": settings.SQLITE_MMAP_SIZE_BYTES,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "foreign_keys": "ON",
+        "temp_store": "MEMORY",
+    }
+
+
+def install_sqlite_profile(engine: Engine) -> None:
+    """Apply sqlite_pragmas() to each connection engine opens."""
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
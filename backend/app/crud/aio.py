@@ -0,0 +1,64 @@
+"""
+Awaitable versions of the CRUD functions for the async route handlers.
+
+Each function takes the same arguments as its counterpart in app.crud.task,
+app.crud.category or app.crud.user, with the session from
+app.core.database.get_session, and runs it through run_db: on the asyncio
+driver when DATABASE_ASYNC is set, in the threadpool otherwise. Functions that
+write go through run_db_write, which queues them on SQLite.
+"""
+import functools
+from app.core.database import DBSession, run_db, run_db_write
+from app.crud import task as task_crud, category as category_crud, user as user_crud
+
+
+def _awaitable(function, writes: bool = False):
+    run = run_db_write if writes else run_db
+    
+    @functools.wraps(function)
+    async def wrapper(db: DBSession, *args, **kwargs):
+        return await run(db, function, *args, **kwargs)
+    return wrapper
+
+
+# Tasks
+get_tasks_with_filters = _awaitable(task_crud.get_tasks_with_filters)
+get_task_by_id = _awaitable(task_crud.get_task_by_id)
+get_task_by_title = _awaitable(task_crud.get_task_by_title)
+create_task = _awaitable(task_crud.create_task, writes=True)
+update_task = _awaitable(task_crud.update_task, writes=True)
+delete_task = _awaitable(task_crud.delete_task, writes=True)
+toggle_task_completion = _awaitable(task_crud.toggle_task_completion, writes=True)
+reorder_task = _awaitable(task_crud.reorder_task, writes=True)
+reorder_tasks = _awaitable(task_crud.reorder_tasks, writes=True)
+rebalance_user_order_keys = _awaitable(task_crud.rebalance_user_order_keys, writes=True)
+bulk_update_tasks = _awaitable(task_crud.bulk_update_tasks, writes=True)
+bulk_delete_tasks = _awaitable(task_crud.bulk_delete_tasks, writes=True)
+bulk_toggle_tasks = _awaitable(task_crud.bulk_toggle_tasks, writes=True)
+create_tasks_batch = _awaitable(task_crud.create_tasks_batch, writes=True)
+import_task_chunk = _awaitable(task_crud.import_task_chunk, writes=True)
+get_overdue_tasks = _awaitable(task_crud.get_overdue_tasks)
+get_tasks_due_today = _awaitable(task_crud.get_tasks_due_today)
+get_high_priority_tasks = _awaitable(task_crud.get_high_priority_tasks)
+get_completed_tasks = _awaitable(task_crud.get_completed_tasks)
+get_pending_tasks = _awaitable(task_crud.get_pending_tasks)
+search_tasks_full_text = _awaitable(task_crud.search_tasks_full_text)
+search_tasks_by_multiple_criteria = _awaitable(task_crud.search_tasks_by_multiple_criteria)
+get_task_statistics = _awaitable(task_crud.get_task_statistics)
+get_task_changes = _awaitable(task_crud.get_task_changes)
+
+# Categories
+get_categories_with_filters = _awaitable(category_crud.get_categories_with_filters)
+get_category_by_id = _awaitable(category_crud.get_category_by_id)
+get_category_by_name = _awaitable(category_crud.get_category_by_name)
+create_category = _awaitable(category_crud.create_category, writes=True)
+update_category = _awaitable(category_crud.update_category, writes=True)
+delete_category = _awaitable(category_crud.delete_category, writes=True)
+
+# Users
+get_user_by_email = _awaitable(user_crud.get_user_by_email)
+get_user_counters = _awaitable(user_crud.get_user_counters)
+create_user = _awaitable(user_crud.create_user, writes=True)
+update_user = _awaitable(user_crud.update_user, writes=True)
+update_password_hash = _awaitable(user_crud.update_password_hash, writes=True)
+authenticate_user = _awaitable(user_crud.authenticate_user)
@@ -3,9 +3,17 @@ Category CRUD operations.
 """
 from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import select, update, func
 from app.models.category import Category
+from app.models.task import Task
+from app.models.user import User
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.core.search import substring_condition
+from app.crud.counts import resolve_total
+from app.crud.user import adjust_user_counters, bump_collection_version, get_collection_version, lock_user_row
+from app.crud.task import invalidate_task_caches, record_task_tombstones
+from app.crud.category_cache import invalidate_user_categories, remember_user_categories
+from app.crud.task_stats import task_state, task_stats_delta, adjust_task_stats
 
 
 def get_categories(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Category]:
@@ -32,7 +40,9 @@ def create_category(db: Session, category_data: CategoryCreate, user_id: int) ->
     category_dict['user_id'] = user_id
     db_category = Category(**category_dict)
     db.add(db_category)
+    adjust_user_counters(db, user_id, categories=1)
     db.commit()
+    invalidate_user_categories(user_id)
     db.refresh(db_category)
     return db_category
 
@@ -48,20 +58,43 @@ def update_category(db: Session, category_id: int, category_data: CategoryUpdate
     for field, value in update_data.items():
         setattr(db_category, field, value)
     
+    # Tasks embed their category, so they show up in GET /tasks/changes too;
+    # updated_at is kept, as the tasks themselves did not change
+    version = bump_collection_version(db, user_id)
+    db.execute(
+        update(Task)
+        .where(Task.category_id == category_id, Task.user_id == user_id)
+        .values(change_version=version, updated_at=Task.updated_at)
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
+    invalidate_user_categories(user_id)
     db.refresh(db_category)
     return db_category
 
 
 def delete_category(db: Session, category_id: int, user_id: int) -> bool:
     """Delete a category for a specific user."""
+    # Before loading the tasks whose states leave the stats with the category
+    lock_user_row(db, user_id)
     stmt = select(Category).where(Category.id == category_id, Category.user_id == user_id)
     db_category = db.scalar(stmt)
     if not db_category:
         return False
     
+    # Tasks in the category are deleted with it (cascade), so they leave the task counters too
+    deleted_states = [task_state(task) for task in db_category.tasks]
+    deleted_task_ids = [task.id for task in db_category.tasks]
+    deleted_tasks = len(deleted_states)
     db.delete(db_category)
+    db.flush()
+    version = adjust_user_counters(db, user_id, tasks=-deleted_tasks, categories=-1)
+    record_task_tombstones(db, user_id, deleted_task_ids, version)
+    adjust_task_stats(db, user_id, task_stats_delta(removed=deleted_states))
     db.commit()
+    invalidate_user_categories(user_id)
+    if deleted_tasks:
+        invalidate_task_caches(user_id)
     return True
 
 
@@ -72,27 +105,28 @@ def get_categories_with_filters(
     limit: int = 100,
     search: Optional[str] = None,
     sort_by: str = "name",
-    sort_order: str = "asc"
-) -> Tuple[List[Category], int]:
+    sort_order: str = "asc",
+    count_mode: str = "exact",
+    counters: Optional[dict] = None
+) -> Tuple[List[Category], Optional[int]]:
     """
     Get categories with filtering and sorting.
     
+    ``count_mode`` works as in get_tasks_with_filters; unfiltered totals
+    come from the user's maintained category counter, taken from ``counters``
+    (get_user_counters) when the caller already loaded them.
+    
     Returns:
-        Tuple of (categories, total_count)
+        Tuple of (categories, total_count); total_count is None when count_mode is "none"
     """
-    from sqlalchemy import or_, asc, desc
+    from sqlalchemy import asc, desc
     
     # Build base query with user filter
     stmt = select(Category).where(Category.user_id == user_id)
     
     # Apply search filter
     if search:
-        search_term = f"%{search}%"
-        search_condition = or_(
-            Category.name.ilike(search_term),
-            Category.description.ilike(search_term)
-        )
-        stmt = stmt.where(search_condition)
+        stmt = stmt.where(substring_condition(db, Category, [Category.name, Category.description], search))
     
     # Apply sorting
     if sort_by == "name":
@@ -107,17 +141,40 @@ def get_categories_with_filters(
     else:
         stmt = stmt.order_by(asc(sort_column))
     
-    # Get total count
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = db.scalar(count_stmt)
+    # A first unfiltered page may hold all categories and prime the task lookup
+    # cache; the version it is cached under must be read before the categories
+    version = None
+    if skip == 0 and not search:
+        version = counters["collection_version"] if counters else get_collection_version(db, user_id)
     
     # Apply pagination
-    stmt = stmt.offset(skip).limit(limit)
-    categories = list(db.scalars(stmt))
+    categories = list(db.scalars(stmt.offset(skip).limit(limit)))
+    
+    # A short page already tells us the exact total
+    page_total = None
+    if len(categories) < limit and (categories or skip == 0):
+        page_total = skip + len(categories)
+        if version is not None:
+            # The page holds all of the user's categories
+            remember_user_categories(user_id, version, categories)
+    
+    total = resolve_total(
+        db,
+        stmt,
+        count_mode,
+        counter_total=counters["category_count"] if counters else count_user_categories(db, user_id),
+        filtered=bool(search),
+        page_total=page_total
+    )
     
     return categories, total
 
 
+def count_user_categories(db: Session, user_id: int) -> int:
+    """Get a user's total number of categories from the maintained counter (a primary-key lookup)."""
+    return db.scalar(select(User.category_count).where(User.id == user_id)) or 0
+
+
 def count_categories(db: Session) -> int:
     """Count total categories."""
     stmt = select(func.count(Category.id))
@@ -0,0 +1,102 @@
+"""
+Per-user category lookup cache.
+
+Users have a few dozen categories at most, so task reads attach each task's
+category from here instead of selecting categories alongside every task query.
+Entries are tagged with the user's collection version, which every category
+write bumps in its own transaction: an entry whose version no longer matches,
+e.g. after a write through another worker, is reloaded, so attached categories
+are never stale. Category writes in this worker also drop the entry directly.
+"""
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.category import Category
+from app.models.task import Task
+from app.crud.user import get_collection_version
+
+# Category fields, in CategoryResponse order, so that cached rows encode to the
+# same JSON as the response model
+CATEGORY_ROW_FIELDS = ("name", "description", "color", "icon", "id", "user_id", "created_at", "updated_at")
+
+# user_id -> (collection version, {category id: category row})
+_category_cache = TTLCache(maxsize=settings.CATEGORY_CACHE_SIZE, ttl=settings.CATEGORY_CACHE_TTL_SECONDS)
+
+
+def get_user_category_rows(db: Session, user_id: int, collection_version: Optional[int] = None) -> Dict[int, dict]:
+    """
+    Get a user's categories as plain rows by id, from the cache when it is current.
+    
+    collection_version is the user's version if the caller already read it
+    (before this call); otherwise it is looked up here.
+    """
+    version = get_collection_version(db, user_id) if collection_version is None else collection_version
+    entry = _category_cache.get(user_id)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    
+    columns = [getattr(Category, field) for field in CATEGORY_ROW_FIELDS]
+    rows = {
+        row["id"]: dict(row)
+        for row in db.execute(select(*columns).where(Category.user_id == user_id)).mappings()
+    }
+    _category_cache.set(user_id, (version, rows))
+    return rows
+
+
+def remember_user_categories(user_id: int, collection_version: int, categories: Iterable[Category]) -> None:
+    """
+    Fill the cache from a complete, already loaded list of the user's categories.
+    
+    collection_version must have been read before the categories were
+    selected: read afterwards, a write committed in between would cache the
+    old categories under the new version.
+    """
+    rows = {
+        category.id: {field: getattr(category, field) for field in CATEGORY_ROW_FIELDS}
+        for category in categories
+    }
+    _category_cache.set(user_id, (collection_version, rows))
+
+
+def invalidate_user_categories(user_id: int) -> None:
+    """Drop a user's cached categories; called after every category write."""
+    _category_cache.invalidate(user_id)
+
+
+def attach_categories(
+    db: Session, user_id: int, tasks: List[Task], collection_version: Optional[int] = None
+) -> None:
+    """
+    Load task.category for a user's tasks from the cache instead of the database.
+    
+    Categories already in the session are reused; the others are merged in
+    from the cached rows without loading (merge(load=False)). Each is set as
+    the task's loaded relationship value, so no lazy load is emitted. A
+    category missing from the cache is left to the lazy load.
+    """
+    categories = {}
+    missing = set()
+    for category_id in {task.category_id for task in tasks if task.category_id is not None}:
+        category = db.identity_map.get(identity_key(Category, category_id))
+        if category is not None:
+            categories[category_id] = category
+        else:
+            missing.add(category_id)
+    if missing:
+        rows = get_user_category_rows(db, user_id, collection_version)
+        for category_id in missing:
+            row = rows.get(category_id)
+            if row is not None:
+                category = Category(**row)
+                make_transient_to_detached(category)
+                categories[category_id] = db.merge(category, load=False)
+    for task in tasks:
+        if task.category_id is None:
+            set_committed_value(task, "category", None)
+        elif task.category_id in categories:
+            set_committed_value(task, "category", categories[task.category_id])
@@ -0,0 +1,67 @@
+"""
+Helpers for resolving list totals without re-running the filtered query.
+"""
+import json
+from typing import Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+
+
+# Accepted values of the ``count`` parameter on list endpoints
+COUNT_MODES = ("exact", "estimated", "none")
+
+
+def resolve_total(
+    db: Session,
+    stmt,
+    count_mode: str,
+    counter_total: int,
+    filtered: bool,
+    page_total: Optional[int] = None
+) -> Optional[int]:
+    """
+    Resolve the total for a list response.
+    
+    Args:
+        stmt: The filtered (unpaginated) select the page was read from
+        count_mode: One of COUNT_MODES
+        counter_total: The maintained per-user total of unfiltered rows
+        filtered: Whether stmt narrows the user's rows in any way
+        page_total: The exact total when it can be derived from the page itself
+            (an offset page that came back short), or None
+    
+    Returns:
+        The total, or None when count_mode is "none"
+    """
+    if count_mode not in COUNT_MODES:
+        raise ValueError(f"count must be one of: {', '.join(COUNT_MODES)}")
+    
+    if count_mode == "none":
+        return None
+    
+    # Unfiltered totals come straight from the maintained counter
+    if not filtered:
+        return counter_total
+    
+    if page_total is not None:
+        return page_total
+    
+    # Estimated: the planner's row estimate, capped by the counter. Other
+    # dialects have no cheap estimate, so they count exactly
+    if count_mode == "estimated" and db.get_bind().dialect.name == "postgresql":
+        return min(_planner_row_estimate(db, stmt), counter_total)
+    return db.scalar(select(func.count()).select_from(stmt.subquery()))
+
+
+def _planner_row_estimate(db: Session, stmt) -> int:
+    """Ask PostgreSQL's planner how many rows a select would return."""
+    compiled = stmt.compile(dialect=db.get_bind().dialect)
+    params = (
+        tuple(compiled.params[name] for name in compiled.positiontup)
+        if compiled.positional else compiled.params
+    )
+    plan = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), params).scalar()
+    # psycopg2 decodes the json result, asyncpg returns it as text
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -1,23 +1,134 @@
 """
 Task CRUD operations - function-based approach with modern SQLAlchemy syntax.
 """
-from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select, or_, desc, asc, func, and_
+import base64
+import json
+from datetime import datetime, date, time, timedelta
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+from pydantic import ValidationError
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import select, insert, update, delete, or_, desc, asc, func, and_, case, bindparam, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from app.models.task import Task
+from app.models.task_tombstone import TaskTombstone
+from app.models.user import User
+from app.models.category import Category
 from app.schemas.task import TaskCreate, TaskUpdate
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.ordering import generate_key_between, generate_n_keys_between, plan_reorder
+from app.core.search import tokenize, apply_text_search, substring_condition
+from app.crud.counts import resolve_total
+from app.crud.user import (
+    adjust_user_counters, bump_collection_version, get_collection_version, get_tombstones_pruned_version, lock_user_row
+)
+from app.crud.category_cache import attach_categories, get_user_category_rows
+from app.crud.task_stats import task_state, task_stats_delta, adjust_task_stats, get_user_task_stats
+
+
+# Columns accepted by the ``sort_by`` parameter of task listings
+TASK_SORT_COLUMNS = {
+    "title": Task.title,
+    "priority": Task.priority,
+    "due_date": Task.due_date,
+    "created_at": Task.created_at,
+    "order_index": Task.order_index,
+}
+
+# Per-user statistics, invalidated by task writes
+_statistics_cache = TTLCache(maxsize=4096, ttl=settings.STATISTICS_CACHE_TTL_SECONDS)
+
+# Rows validated and inserted per executemany by batch creation and import
+TASK_IMPORT_CHUNK_SIZE = 500
+
+# Rejected rows reported individually per batch/import; the rest are only counted
+MAX_REPORTED_IMPORT_ERRORS = 100
+
+# Columns written by the task export, in output order
+TASK_EXPORT_COLUMNS = (
+    Task.id, Task.title, Task.description, Task.completed, Task.priority, Task.due_date,
+    Task.order_index, Task.category_id, Task.created_at, Task.updated_at,
+)
+
+# Sort columns whose values are datetimes and must be round-tripped through ISO strings
+_DATETIME_SORT_FIELDS = {"due_date", "created_at"}
+
+# Fields of task rows (as_rows=True), in TaskResponse order, so that rows encode
+# to the same JSON as the response model
+TASK_ROW_FIELDS = (
+    "title", "description", "priority", "due_date", "category_id", "id", "completed",
+    "order_index", "user_id", "created_at", "updated_at",
+)
+
+
+def parse_task_fields(fields: str) -> Tuple[str, ...]:
+    """
+    Parse a comma-separated ``fields`` parameter into task row fields, in row order.
+    
+    The id is always included, so clients can still address the tasks.
+    
+    Raises:
+        ValueError: If a field is not a task field
+    """
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = sorted(requested - set(TASK_ROW_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown task fields: {', '.join(unknown)}")
+    return tuple(field for field in TASK_ROW_FIELDS if field in requested or field == "id")
+
+
+def _fetch_tasks(
+    db: Session,
+    user_id: int,
+    stmt,
+    as_rows: bool = False,
+    fields: Optional[Sequence[str]] = None,
+    include_category: bool = True,
+    collection_version: Optional[int] = None
+) -> list:
+    """
+    Run a select(Task) statement over a user's tasks and return them.
+    
+    By default as Task objects with their category attached from the
+    per-user category cache, so the statement is the only task query. With
+    ``as_rows`` (implied by ``fields`` or by leaving out the category) only the
+    response columns are selected and each task comes back as a plain dict
+    shaped like TaskResponse, ready for direct JSON encoding: no ORM objects,
+    identity map or response validation. ``fields`` narrows the task columns
+    selected, and the category is embedded only when ``include_category`` is set.
+    ``collection_version`` is passed on to the category cache check.
+    """
+    if not (as_rows or fields or not include_category):
+        tasks = list(db.scalars(stmt))
+        attach_categories(db, user_id, tasks, collection_version)
+        return tasks
+    fields = tuple(fields or TASK_ROW_FIELDS)
+    # The category id is needed to look the category up, even when not requested
+    selected = fields + ("category_id",) if include_category and "category_id" not in fields else fields
+    stmt = stmt.with_only_columns(*(getattr(Task, field) for field in selected), maintain_column_froms=True)
+    
+    tasks = [dict(zip(selected, row)) for row in db.execute(stmt)]
+    if include_category:
+        categories = {}
+        if any(task["category_id"] for task in tasks):
+            categories = get_user_category_rows(db, user_id, collection_version)
+        for task in tasks:
+            category_id = task["category_id"] if "category_id" in fields else task.pop("category_id")
+            task["category"] = categories.get(category_id)
+    return tasks
 
 
 def get_tasks(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Task]:
     """Get all tasks for a specific user with pagination."""
-    stmt = select(Task).options(selectinload(Task.category)).where(Task.user_id == user_id).offset(skip).limit(limit)
-    return list(db.scalars(stmt))
+    stmt = select(Task).where(Task.user_id == user_id).offset(skip).limit(limit)
+    return _fetch_tasks(db, user_id, stmt)
 
 
 def get_task_by_id(db: Session, task_id: int, user_id: int) -> Optional[Task]:
     """Get a task by ID for a specific user."""
-    stmt = select(Task).options(selectinload(Task.category)).where(Task.id == task_id, Task.user_id == user_id)
-    return db.scalar(stmt)
+    stmt = select(Task).where(Task.id == task_id, Task.user_id == user_id)
+    tasks = _fetch_tasks(db, user_id, stmt)
+    return tasks[0] if tasks else None
 
 
 def get_task_by_title(db: Session, title: str, user_id: int) -> Optional[Task]:
@@ -27,78 +138,483 @@ def get_task_by_title(db: Session, title: str, user_id: int) -> Optional[Task]:
 
 
 def create_task(db: Session, task_data: TaskCreate, user_id: int) -> Task:
-    """Create a new task for a specific user."""
-    # Get the next order index if not provided
-    if not hasattr(task_data, 'order_index') or task_data.order_index is None:
-        max_order_stmt = select(func.max(Task.order_index)).where(Task.user_id == user_id)
-        max_order = db.scalar(max_order_stmt) or 0.0
-        task_data_dict = task_data.model_dump()
-        task_data_dict['order_index'] = max_order + 1.0
-    else:
-        task_data_dict = task_data.model_dump()
+    """Create a new task for a specific user, placed after the user's last task."""
+    task_data_dict = task_data.model_dump()
+    if task_data_dict.get('order_index') is None:
+        task_data_dict['order_index'] = generate_key_between(_last_order_key(db, user_id), None)
     
     task_data_dict['user_id'] = user_id
+    task_data_dict['change_version'] = adjust_user_counters(db, user_id, tasks=1)
     db_task = Task(**task_data_dict)
     db.add(db_task)
+    db.flush()
+    adjust_task_stats(db, user_id, task_stats_delta(added=[task_state(db_task)]))
     db.commit()
+    invalidate_task_caches(user_id)
     db.refresh(db_task)
     return db_task
 
 
+def new_import_report() -> dict:
+    """Empty result of a batch creation or import, filled in by import_task_chunk."""
+    return {"accepted": 0, "rejected": 0, "errors": [], "errors_truncated": False}
+
+
+def reject_import_row(report: dict, row: int, detail: str) -> None:
+    """Count a rejected row, keeping its reason while the report has room for it."""
+    report["rejected"] += 1
+    if len(report["errors"]) < MAX_REPORTED_IMPORT_ERRORS:
+        report["errors"].append({"row": row, "detail": detail})
+    else:
+        report["errors_truncated"] = True
+
+
+def import_task_chunk(db: Session, user_id: int, rows: List[Tuple[int, Any]], report: dict) -> None:
+    """
+    Validate and insert one chunk of (row number, task data) pairs for a specific user.
+    
+    Valid rows are appended after the user's last task with a single executemany
+    INSERT and committed together; invalid rows and duplicate titles (against the
+    user's tasks, earlier chunks included, and within the chunk) are rejected.
+    Duplicate checks go to the database, so memory stays bounded by the chunk size.
+    """
+    candidates = []
+    titles = set()
+    for row, data in rows:
+        try:
+            task = TaskCreate.model_validate(data)
+        except ValidationError as e:
+            reject_import_row(report, row, "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'task'}: {error['msg']}" for error in e.errors()
+            ))
+            continue
+        if task.title in titles:
+            reject_import_row(report, row, f"Task with title '{task.title}' already exists")
+            continue
+        titles.add(task.title)
+        candidates.append((row, task))
+    if not candidates:
+        return
+    
+    existing_titles = set(db.scalars(select(Task.title).where(Task.user_id == user_id, Task.title.in_(titles))))
+    category_ids = {task.category_id for _, task in candidates if task.category_id is not None}
+    owned_categories = set(db.scalars(
+        select(Category.id).where(Category.id.in_(category_ids), Category.user_id == user_id)
+    )) if category_ids else set()
+    
+    values = []
+    order_key = _last_order_key(db, user_id)
+    for row, task in candidates:
+        if task.title in existing_titles:
+            reject_import_row(report, row, f"Task with title '{task.title}' already exists")
+        elif task.category_id is not None and task.category_id not in owned_categories:
+            reject_import_row(report, row, f"Category {task.category_id} not found")
+        else:
+            order_key = generate_key_between(order_key, None)
+            values.append({**task.model_dump(), "user_id": user_id, "order_index": order_key, "completed": False})
+    if not values:
+        return
+    
+    version = adjust_user_counters(db, user_id, tasks=len(values))
+    for value in values:
+        value["change_version"] = version
+    db.execute(insert(Task), values)
+    adjust_task_stats(db, user_id, task_stats_delta(added=[(False, value["priority"], 1) for value in values]))
+    db.commit()
+    invalidate_task_caches(user_id)
+    report["accepted"] += len(values)
+
+
+def create_tasks_batch(db: Session, user_id: int, rows: Iterable[Tuple[int, Any]]) -> dict:
+    """
+    Create tasks from (row number, task data) pairs in chunks of TASK_IMPORT_CHUNK_SIZE.
+    
+    Each chunk is committed on its own, so rows accepted before a later failure stay.
+    
+    Returns:
+        The import report: accepted and rejected counts plus per-row rejection reasons
+    """
+    report = new_import_report()
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= TASK_IMPORT_CHUNK_SIZE:
+            import_task_chunk(db, user_id, chunk, report)
+            chunk = []
+    if chunk:
+        import_task_chunk(db, user_id, chunk, report)
+    return report
+
+
 def update_task(db: Session, task_id: int, task_data: TaskUpdate, user_id: int) -> Optional[Task]:
     """Update a task for a specific user."""
+    # Before reading the task, whose current state the stats delta is computed from
+    lock_user_row(db, user_id)
     stmt = select(Task).options(selectinload(Task.category)).where(Task.id == task_id, Task.user_id == user_id)
     db_task = db.scalar(stmt)
     if not db_task:
         return None
     
+    before = task_state(db_task)
+    db_task.change_version = bump_collection_version(db, user_id)
     update_data = task_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_task, field, value)
     
+    db.flush()
+    adjust_task_stats(db, user_id, task_stats_delta(removed=[before], added=[task_state(db_task)]))
     db.commit()
+    invalidate_task_caches(user_id)
     db.refresh(db_task)
     return db_task
 
 
 def delete_task(db: Session, task_id: int, user_id: int) -> bool:
     """Delete a task for a specific user."""
+    # Before reading the task, whose current state the stats delta is computed from
+    lock_user_row(db, user_id)
     stmt = select(Task).where(Task.id == task_id, Task.user_id == user_id)
     db_task = db.scalar(stmt)
     if not db_task:
         return False
     
     db.delete(db_task)
+    db.flush()
+    version = adjust_user_counters(db, user_id, tasks=-1)
+    record_task_tombstones(db, user_id, [task_id], version)
+    adjust_task_stats(db, user_id, task_stats_delta(removed=[task_state(db_task)]))
     db.commit()
+    invalidate_task_caches(user_id)
     return True
 
 
 def toggle_task_completion(db: Session, task_id: int, user_id: int) -> Optional[Task]:
     """Toggle task completion status for a specific user."""
+    # Before reading the task, whose current state the stats delta is computed from
+    lock_user_row(db, user_id)
     stmt = select(Task).options(selectinload(Task.category)).where(Task.id == task_id, Task.user_id == user_id)
     db_task = db.scalar(stmt)
     if not db_task:
         return None
     
+    before = task_state(db_task)
+    db_task.change_version = bump_collection_version(db, user_id)
     db_task.completed = not db_task.completed
+    db.flush()
+    adjust_task_stats(db, user_id, task_stats_delta(removed=[before], added=[task_state(db_task)]))
     db.commit()
+    invalidate_task_caches(user_id)
     db.refresh(db_task)
     return db_task
 
 
-def reorder_task(db: Session, task_id: int, new_order_index: float, user_id: int) -> Optional[Task]:
-    """Reorder a task by updating its order index for a specific user."""
+def reorder_task(
+    db: Session,
+    task_id: int,
+    user_id: int,
+    after_task_id: Optional[int] = None,
+    before_task_id: Optional[int] = None
+) -> Optional[Task]:
+    """
+    Move a task between two neighbours for a specific user.
+    
+    Only the moved task's order key changes. A missing neighbour is looked up
+    as the task next to the given one, so either ID alone is enough.
+    
+    Raises:
+        ValueError: If no neighbour is given, a neighbour does not exist, or the
+            neighbours are not in order
+    """
     stmt = select(Task).options(selectinload(Task.category)).where(Task.id == task_id, Task.user_id == user_id)
     db_task = db.scalar(stmt)
     if not db_task:
         return None
     
-    db_task.order_index = new_order_index
+    if after_task_id is None and before_task_id is None:
+        raise ValueError("after_task_id or before_task_id is required")
+    if task_id in (after_task_id, before_task_id):
+        raise ValueError("A task cannot be moved next to itself")
+    
+    neighbour_ids = [i for i in (after_task_id, before_task_id) if i is not None]
+    neighbour_keys = dict(db.execute(
+        select(Task.id, Task.order_index).where(Task.id.in_(neighbour_ids), Task.user_id == user_id)
+    ).all())
+    missing = [i for i in neighbour_ids if i not in neighbour_keys]
+    if missing:
+        raise ValueError(f"Tasks not found: {missing}")
+    
+    # Neighbours can share a key after concurrent appends; spread the keys out once and retry
+    for attempt in range(2):
+        after_key, before_key = _neighbour_order_keys(
+            db, user_id, task_id, neighbour_keys.get(after_task_id), neighbour_keys.get(before_task_id)
+        )
+        if after_key is None or before_key is None or after_key < before_key:
+            break
+        if after_key > before_key or attempt:
+            raise ValueError("after_task_id must come before before_task_id")
+        rebalance_order_keys(db, user_id)
+        neighbour_keys = dict(db.execute(
+            select(Task.id, Task.order_index).where(Task.id.in_(neighbour_ids), Task.user_id == user_id)
+        ).all())
+    
+    db_task.change_version = bump_collection_version(db, user_id)
+    db_task.order_index = generate_key_between(after_key, before_key)
     db.commit()
+    invalidate_task_caches(user_id)
     db.refresh(db_task)
     return db_task
 
 
+def _neighbour_order_keys(
+    db: Session, user_id: int, task_id: int, after_key: Optional[str], before_key: Optional[str]
+) -> Tuple[Optional[str], Optional[str]]:
+    """Fill in the missing side of a (after, before) key pair from the user's adjacent task."""
+    others = and_(Task.user_id == user_id, Task.id != task_id)
+    if before_key is None:
+        before_key = db.scalar(
+            select(Task.order_index).where(others, Task.order_index > after_key)
+            .order_by(asc(Task.order_index)).limit(1)
+        )
+    elif after_key is None:
+        after_key = db.scalar(
+            select(Task.order_index).where(others, Task.order_index < before_key)
+            .order_by(desc(Task.order_index)).limit(1)
+        )
+    return after_key, before_key
+
+
+def _last_order_key(db: Session, user_id: int) -> Optional[str]:
+    """The user's greatest order key, read from the end of the (user_id, order_index) index."""
+    stmt = select(Task.order_index).where(Task.user_id == user_id).order_by(desc(Task.order_index)).limit(1)
+    return db.scalar(stmt)
+
+
+def get_tasks_by_ids(db: Session, task_ids: List[int], user_id: int) -> List[Task]:
+    """Get a user's tasks by ID in one query, in the order the IDs were given."""
+    # Many-to-one, so the join adds no rows and the categories come with the same SELECT
+    stmt = select(Task).options(joinedload(Task.category)).where(Task.id.in_(task_ids), Task.user_id == user_id)
+    position = {task_id: index for index, task_id in enumerate(task_ids)}
+    return sorted(db.scalars(stmt), key=lambda task: position[task.id])
+
+
+def bulk_update_tasks(db: Session, task_ids: List[int], task_data: TaskUpdate, user_id: int) -> List[Task]:
+    """
+    Apply the same update to several tasks of a specific user in one transaction.
+    
+    Issues a single UPDATE ... WHERE id IN (...) AND user_id = ... and reads the
+    changed rows back with one query. Nothing is changed unless every task exists.
+    
+    Raises:
+        ValueError: If any of the tasks does not exist for the user
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    update_data = task_data.model_dump(exclude_unset=True)
+    
+    # Stats only need the previous state when a counted column changes
+    before_states = []
+    if "completed" in update_data or "priority" in update_data:
+        lock_user_row(db, user_id)
+        rows = db.execute(
+            select(Task.completed, Task.priority).where(Task.id.in_(task_ids), Task.user_id == user_id)
+        ).all()
+        if len(rows) != len(task_ids):
+            db.rollback()
+            raise ValueError(f"Tasks not found: {_missing_task_ids(db, task_ids, user_id)}")
+        before_states = [(bool(completed), priority, 1) for completed, priority in rows]
+    
+    version = bump_collection_version(db, user_id)
+    stmt = (
+        update(Task)
+        .where(Task.id.in_(task_ids), Task.user_id == user_id)
+        .values(**update_data, change_version=version)
+        .execution_options(synchronize_session=False)
+    )
+    if db.execute(stmt).rowcount != len(task_ids):
+        db.rollback()
+        raise ValueError(f"Tasks not found: {_missing_task_ids(db, task_ids, user_id)}")
+    
+    if before_states:
+        after_states = [
+            (bool(update_data.get("completed", completed)), update_data.get("priority", priority), count)
+            for completed, priority, count in before_states
+        ]
+        adjust_task_stats(db, user_id, task_stats_delta(removed=before_states, added=after_states))
+    
+    db.commit()
+    invalidate_task_caches(user_id)
+    return get_tasks_by_ids(db, task_ids, user_id)
+
+
+def reorder_tasks(db: Session, task_ids: List[int], user_id: int) -> List[Task]:
+    """
+    Reorder a user's tasks to follow the order of task_ids.
+    
+    Tasks already in the right relative order keep their order keys; only the
+    others get new keys between their neighbours, so dragging one task in a full
+    list rewrites a single row. Nothing is changed unless every task exists.
+    
+    Raises:
+        ValueError: If any of the tasks does not exist for the user
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    current = dict(db.execute(
+        select(Task.id, Task.order_index).where(Task.id.in_(task_ids), Task.user_id == user_id)
+    ).all())
+    if len(current) != len(task_ids):
+        raise ValueError(f"Tasks not found: {[task_id for task_id in task_ids if task_id not in current]}")
+    
+    changes = plan_reorder([current[task_id] for task_id in task_ids])
+    if changes:
+        version = bump_collection_version(db, user_id)
+        _set_order_keys(db, user_id, {task_ids[position]: key for position, key in changes.items()}, version)
+        db.commit()
+        invalidate_task_caches(user_id)
+    return get_tasks_by_ids(db, task_ids, user_id)
+
+
+def rebalance_order_keys(db: Session, user_id: int) -> int:
+    """
+    Give all of a user's tasks short, evenly spaced order keys in their current order.
+    
+    Runs inside the caller's transaction; the caller commits.
+    
+    Returns:
+        The number of tasks rewritten
+    """
+    task_ids = db.scalars(
+        select(Task.id).where(Task.user_id == user_id).order_by(asc(Task.order_index), asc(Task.id))
+    ).all()
+    keys = generate_n_keys_between(None, None, len(task_ids))
+    return _set_order_keys(db, user_id, dict(zip(task_ids, keys)), bump_collection_version(db, user_id))
+
+
+def rebalance_user_order_keys(db: Session, user_id: int) -> int:
+    """rebalance_order_keys in a transaction of its own, for the background rebalance."""
+    rewritten = rebalance_order_keys(db, user_id)
+    db.commit()
+    invalidate_task_caches(user_id)
+    return rewritten
+
+
+def needs_order_rebalance(tasks: List[Task]) -> bool:
+    """Whether any of the tasks' order keys has grown past the rebalancing threshold."""
+    return any(len(task.order_index) > settings.ORDER_KEY_REBALANCE_LENGTH for task in tasks)
+
+
+def _set_order_keys(db: Session, user_id: int, keys_by_id: dict, change_version: int) -> int:
+    """Set the order keys of several of a user's tasks in one UPDATE; returns the row count."""
+    task_ids, keys = list(keys_by_id), list(keys_by_id.values())
+    dialect = db.get_bind().dialect.name
+    
+    # Join against the ID and key lists passed as array/JSON parameters, so the statement
+    # has the same shape (and a cached compiled form) for any number of tasks
+    if dialect == "sqlite":
+        positions = func.json_each(json.dumps(task_ids)).table_valued("key", "value")
+        new_key = func.json_extract(json.dumps(keys), func.printf("$[%d]", positions.c.key))
+        # "+ 0" keeps SQLite from driving the join off the user_id index, so it walks
+        # the ID list and looks each task up by primary key instead
+        stmt = update(Task).where(Task.id == positions.c.value, Task.user_id + 0 == user_id).values(
+            order_index=new_key, change_version=change_version
+        )
+    elif dialect == "postgresql":
+        positions = func.unnest(
+            bindparam("task_ids", task_ids, type_=ARRAY(Integer)),
+            bindparam("order_keys", keys, type_=ARRAY(String))
+        ).table_valued("id", "order_key").render_derived()
+        stmt = update(Task).where(Task.id == positions.c.id, Task.user_id == user_id).values(
+            order_index=positions.c.order_key, change_version=change_version
+        )
+    else:
+        stmt = (
+            update(Task)
+            .where(Task.id.in_(task_ids), Task.user_id == user_id)
+            .values(order_index=case(keys_by_id, value=Task.id), change_version=change_version)
+        )
+    return db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+
+
+def bulk_delete_tasks(db: Session, task_ids: List[int], user_id: int) -> int:
+    """
+    Delete several tasks of a specific user with one DELETE ... RETURNING.
+    
+    Nothing is deleted unless every task exists.
+    
+    Returns:
+        The number of deleted tasks
+    
+    Raises:
+        ValueError: If any of the tasks does not exist for the user
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    # Take the user row before the task rows, in the same order as every other write
+    lock_user_row(db, user_id)
+    stmt = (
+        delete(Task)
+        .where(Task.id.in_(task_ids), Task.user_id == user_id)
+        .returning(Task.id, Task.completed, Task.priority)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = db.execute(stmt).all()
+    if len(deleted) != len(task_ids):
+        db.rollback()
+        raise ValueError(f"Tasks not found: {_missing_task_ids(db, task_ids, user_id)}")
+    
+    version = adjust_user_counters(db, user_id, tasks=-len(deleted))
+    record_task_tombstones(db, user_id, [task_id for task_id, _, _ in deleted], version)
+    adjust_task_stats(db, user_id, task_stats_delta(
+        removed=[(bool(completed), priority, 1) for _, completed, priority in deleted]
+    ))
+    db.commit()
+    invalidate_task_caches(user_id)
+    return len(deleted)
+
+
+def bulk_toggle_tasks(db: Session, task_ids: List[int], user_id: int) -> List[Task]:
+    """
+    Toggle completion of several tasks of a specific user with one UPDATE ... RETURNING.
+    
+    Nothing is changed unless every task exists.
+    
+    Raises:
+        ValueError: If any of the tasks does not exist for the user
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    version = bump_collection_version(db, user_id)
+    stmt = (
+        update(Task)
+        .where(Task.id.in_(task_ids), Task.user_id == user_id)
+        .values(completed=~Task.completed, change_version=version)
+        .returning(Task.completed, Task.priority)
+        .execution_options(synchronize_session=False)
+    )
+    toggled = db.execute(stmt).all()
+    if len(toggled) != len(task_ids):
+        db.rollback()
+        raise ValueError(f"Tasks not found: {_missing_task_ids(db, task_ids, user_id)}")
+    
+    adjust_task_stats(db, user_id, task_stats_delta(
+        removed=[(not completed, priority, 1) for completed, priority in toggled],
+        added=[(bool(completed), priority, 1) for completed, priority in toggled]
+    ))
+    db.commit()
+    invalidate_task_caches(user_id)
+    return get_tasks_by_ids(db, task_ids, user_id)
+
+
+def record_task_tombstones(db: Session, user_id: int, task_ids: List[int], change_version: int) -> None:
+    """Record deleted tasks for GET /tasks/changes, in the caller's transaction."""
+    if task_ids:
+        db.execute(insert(TaskTombstone), [
+            {"user_id": user_id, "task_id": task_id, "change_version": change_version} for task_id in task_ids
+        ])
+
+
+def _missing_task_ids(db: Session, task_ids: List[int], user_id: int) -> List[int]:
+    """Return the IDs in task_ids that do not belong to an existing task of the user."""
+    existing = set(db.scalars(select(Task.id).where(Task.id.in_(task_ids), Task.user_id == user_id)))
+    return [task_id for task_id in task_ids if task_id not in existing]
+
+
 def get_tasks_with_filters(
     db: Session,
     user_id: int,
@@ -111,25 +627,45 @@ def get_tasks_with_filters(
     due_date_from: Optional[str] = None,
     due_date_to: Optional[str] = None,
     sort_by: str = "order_index",
-    sort_order: str = "asc"
-) -> Tuple[List[Task], int]:
+    sort_order: str = "asc",
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
+    as_rows: bool = False,
+    fields: Optional[Sequence[str]] = None,
+    include_category: bool = True,
+    counters: Optional[dict] = None
+) -> Tuple[List[Task], Optional[int], Optional[str]]:
     """
     Get tasks with filtering, searching, and sorting.
     
+    Pages by offset (``skip``) unless ``cursor`` is given, in which case the
+    page starts right after the task the cursor points at and ``skip`` is
+    ignored. Keyset pages cost the same at any depth and do not shift when
+    rows before them change.
+    
+    ``count_mode`` picks how total_count is produced: "exact" counts the
+    filtered rows, "estimated" returns PostgreSQL's planner estimate (an
+    exact count on other databases) and "none" skips counting. Unfiltered
+    totals always come from the user's maintained task counter, so they
+    never need a count query. ``counters`` takes the
+    user's get_user_counters when the caller already loaded them.
+    
+    With ``as_rows``, ``fields`` or without ``include_category`` the tasks are
+    plain dicts holding only the requested data (see _fetch_tasks).
+    
     Returns:
-        Tuple of (tasks, total_count)
+        Tuple of (tasks, total_count, next_cursor); next_cursor is None on the last page
+        and total_count is None when count_mode is "none"
+    
+    Raises:
+        ValueError: If the cursor or count mode is invalid
     """
     # Build base query with user filter
-    stmt = select(Task).options(selectinload(Task.category)).where(Task.user_id == user_id)
+    stmt = select(Task).where(Task.user_id == user_id)
     
     # Apply search filter
     if search:
-        search_term = f"%{search}%"
-        search_condition = or_(
-            Task.title.ilike(search_term),
-            Task.description.ilike(search_term)
-        )
-        stmt = stmt.where(search_condition)
+        stmt = stmt.where(substring_condition(db, Task, [Task.title, Task.description], search))
     
     # Apply completion filter
     if completed is not None:
@@ -157,52 +693,312 @@ def get_tasks_with_filters(
     if due_date_to:
         stmt = stmt.where(Task.due_date <= due_date_to)
     
-    # Apply sorting
-    if sort_by == "title":
-        sort_column = Task.title
-    elif sort_by == "priority":
-        sort_column = Task.priority
-    elif sort_by == "due_date":
-        sort_column = Task.due_date
-    elif sort_by == "created_at":
-        sort_column = Task.created_at
-    elif sort_by == "order_index":
-        sort_column = Task.order_index
+    # Resolve sorting and validate the cursor before touching the database
+    if sort_by not in TASK_SORT_COLUMNS:
+        sort_by = "order_index"
+    sort_column = TASK_SORT_COLUMNS[sort_by]
+    descending = sort_order.lower() == "desc"
+    cursor_condition = _cursor_condition(cursor, sort_by, descending) if cursor else None
+    filtered_stmt = stmt
+    
+    # Apply sorting - the id tiebreaker gives every row a unique position for keyset paging
+    direction = desc if descending else asc
+    stmt = stmt.order_by(direction(sort_column).nulls_last(), direction(Task.id))
+    
+    # Apply pagination: keyset when a cursor is given, offset otherwise
+    if cursor_condition is not None:
+        stmt = stmt.where(cursor_condition)
     else:
-        sort_column = Task.order_index
+        stmt = stmt.offset(skip)
+    
+    # Fetch one extra row to know whether another page exists
+    # The sort field is selected for the cursor even when it was not requested
+    selected = fields and tuple(field for field in TASK_ROW_FIELDS if field in fields or field in ("id", sort_by))
+    tasks = _fetch_tasks(
+        db, user_id, stmt.limit(limit + 1), as_rows, selected, include_category,
+        collection_version=counters["collection_version"] if counters else None
+    )
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_task_cursor(tasks[-1], sort_by, descending)
+    if fields and sort_by not in fields:
+        for task in tasks:
+            del task[sort_by]
+    
+    # A short, non-empty offset page (or a short first page) already tells us the exact total
+    page_total = None
+    if cursor_condition is None and next_cursor is None and (tasks or skip == 0):
+        page_total = skip + len(tasks)
+    
+    filtered = any(
+        value is not None
+        for value in (search or None, completed, category_id, priority, due_date_from or None, due_date_to or None)
+    )
+    total = resolve_total(
+        db,
+        filtered_stmt,
+        count_mode,
+        counter_total=counters["task_count"] if counters else count_user_tasks(db, user_id),
+        filtered=filtered,
+        page_total=page_total
+    )
+    
+    return tasks, total, next_cursor
+
+
+def stream_user_tasks(db: Session, user_id: int, batch_size: int = 1000) -> Iterator[dict]:
+    """
+    Yield all of a user's tasks in list order as plain column mappings.
+    
+    Rows are fetched batch_size at a time from a server-side cursor where the
+    driver supports one, and no ORM objects are built, so memory stays constant
+    however many tasks the user has.
+    """
+    stmt = (
+        select(*TASK_EXPORT_COLUMNS)
+        .where(Task.user_id == user_id)
+        .order_by(asc(Task.order_index), asc(Task.id))
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+    for row in db.execute(stmt).mappings():
+        yield row
+
+
+class ChangeCursorExpired(Exception):
+    """Raised when a changes cursor is older than the retained tombstones; the client must resync."""
+
+
+def _after_change(version_column, id_column, kind: str, since: tuple):
+    """
+    Keyset predicate for one kind of change ("deleted" or "task") after a changes cursor position.
     
-    if sort_order.lower() == "desc":
-        stmt = stmt.order_by(desc(sort_column))
+    Changes are ordered by (change_version, kind, id), deletions first within a
+    version, so that clients applying a page in order delete before they upsert.
+    """
+    since_version, since_kind, since_id = since
+    if since_kind is None:
+        return version_column > since_version
+    if since_kind == kind:
+        # The redundant >= keeps a lower bound on the index range scan
+        return and_(version_column >= since_version, or_(version_column > since_version, id_column > since_id))
+    if kind == "task":
+        # The cursor is on a deletion, and a version's tasks come after its deletions
+        return version_column >= since_version
+    return version_column > since_version
+
+
+def get_task_changes(
+    db: Session,
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Tuple[List[Task], List[dict], str, bool]:
+    """
+    Get a user's tasks created or updated, and those deleted, after a change cursor.
+    
+    Changes are read in (change_version, id) order from the (user_id,
+    change_version, id) index on tasks and the (user_id, change_version)
+    index on tombstones, so a client that was briefly away reads only the
+    rows that changed. ``limit`` bounds deleted tasks and changed tasks
+    together; a page may end inside a version, since one transaction can
+    write many tasks. Without a cursor every task is returned (and no
+    tombstones), which is how a client starts syncing. Clients apply
+    ``deleted`` before ``tasks``: SQLite can reuse the id of a deleted task.
+    
+    Returns:
+        Tuple of (tasks, deleted tasks as {"id", "deleted_at"}, cursor for the
+        next call, whether more changes are waiting)
+    
+    Raises:
+        ValueError: If the cursor is malformed
+        ChangeCursorExpired: If tombstones the cursor still needs were pruned
+    """
+    since = decode_change_cursor(cursor) if cursor else (-1, None, None)
+    # Read before the changes: versions commit in order, so everything up to
+    # it is visible, and later writes are left for the next call
+    current_version = get_collection_version(db, user_id)
+    
+    task_stmt = (
+        select(Task)
+        .where(
+            Task.user_id == user_id,
+            Task.change_version <= current_version,
+            _after_change(Task.change_version, Task.id, "task", since)
+        )
+        .order_by(asc(Task.change_version), asc(Task.id))
+        .limit(limit + 1)
+    )
+    changes = [(task.change_version, "task", task.id, task) for task in _fetch_tasks(db, user_id, task_stmt)]
+    if cursor:
+        tombstone_stmt = (
+            select(TaskTombstone.id, TaskTombstone.change_version, TaskTombstone.task_id, TaskTombstone.deleted_at)
+            .where(
+                TaskTombstone.user_id == user_id,
+                TaskTombstone.change_version <= current_version,
+                _after_change(TaskTombstone.change_version, TaskTombstone.id, "deleted", since)
+            )
+            .order_by(asc(TaskTombstone.change_version), asc(TaskTombstone.id))
+            .limit(limit + 1)
+        )
+        changes += [
+            (row.change_version, "deleted", row.id, {"id": row.task_id, "deleted_at": row.deleted_at})
+            for row in db.execute(tombstone_stmt)
+        ]
+        # Checked after reading the tombstones, so a prune that committed before then is seen.
+        # Pruning takes whole versions, so a cursor inside the deletions of the last pruned
+        # version has lost the rest of them too
+        pruned_version = get_tombstones_pruned_version(db, user_id)
+        if since[0] < pruned_version or (since[0] == pruned_version and since[1] == "deleted"):
+            raise ChangeCursorExpired()
+    
+    # "deleted" sorts before "task" within a version
+    changes.sort(key=lambda change: change[:3])
+    has_more = len(changes) > limit
+    if has_more:
+        changes = changes[:limit]
+        position = changes[-1][:3]
+    elif current_version >= since[0]:
+        position = (current_version, None, None)
     else:
-        stmt = stmt.order_by(asc(sort_column))
+        # A cursor ahead of this database (e.g. from the primary, read on a lagging replica) is kept
+        position = since
+    
+    tasks = [item for _, kind, _, item in changes if kind == "task"]
+    deleted = [item for _, kind, _, item in changes if kind == "deleted"]
+    return tasks, deleted, encode_change_cursor(*position), has_more
+
+
+def prune_task_tombstones(db: Session, older_than: datetime) -> int:
+    """
+    Delete the tombstones of tasks deleted before older_than, for every user.
     
-    # Get total count
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = db.scalar(count_stmt)
+    Per user, all tombstones up to the newest pruned version go, and the
+    user's tombstones_pruned_version records it: changes cursors before it
+    have lost deletions and get ChangeCursorExpired. Runs in the caller's
+    transaction; the caller commits.
     
-    # Apply pagination
-    stmt = stmt.offset(skip).limit(limit)
-    tasks = list(db.scalars(stmt))
+    Returns:
+        The number of tombstones deleted
+    """
+    pruned = db.execute(
+        select(TaskTombstone.user_id, func.max(TaskTombstone.change_version))
+        .where(TaskTombstone.deleted_at < older_than)
+        .group_by(TaskTombstone.user_id)
+    ).all()
+    deleted = 0
+    for user_id, version in pruned:
+        db.execute(
+            update(User)
+            .where(User.id == user_id, User.tombstones_pruned_version < version)
+            .values(tombstones_pruned_version=version)
+        )
+        deleted += db.execute(
+            delete(TaskTombstone).where(TaskTombstone.user_id == user_id, TaskTombstone.change_version <= version)
+        ).rowcount
+    return deleted
+
+
+def count_user_tasks(db: Session, user_id: int) -> int:
+    """Get a user's total number of tasks from the maintained counter (a primary-key lookup)."""
+    return db.scalar(select(User.task_count).where(User.id == user_id)) or 0
+
+
+def encode_task_cursor(task: Task, sort_by: str, descending: bool) -> str:
+    """Encode the position of a task (a Task or a task row dict) in a listing as an opaque cursor string."""
+    value = task[sort_by] if isinstance(task, dict) else getattr(task, sort_by)
+    if value is not None and sort_by in _DATETIME_SORT_FIELDS:
+        value = value.isoformat()
+    task_id = task["id"] if isinstance(task, dict) else task.id
+    payload = {"s": sort_by, "d": descending, "v": value, "id": task_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_task_cursor(cursor: str) -> dict:
+    """Decode a cursor produced by encode_task_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, dict) or not isinstance(payload.get("id"), int):
+            raise ValueError
+        if payload.get("s") in _DATETIME_SORT_FIELDS and payload.get("v") is not None:
+            payload["v"] = datetime.fromisoformat(payload["v"])
+        return payload
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def encode_change_cursor(change_version: int, kind: Optional[str], change_id: Optional[int]) -> str:
+    """
+    Encode a position in a user's change sequence as an opaque cursor string.
     
-    return tasks, total
+    kind ("deleted" or "task") and change_id (tombstone or task id) identify
+    the last change returned from the change_version group; both are None
+    once the whole group has been returned.
+    """
+    raw = json.dumps({"cv": change_version, "k": kind, "id": change_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_change_cursor(cursor: str) -> Tuple[int, Optional[str], Optional[int]]:
+    """Decode a cursor produced by encode_change_cursor into (change_version, kind, change_id)."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(payload, dict) or not isinstance(payload.get("cv"), int):
+            raise ValueError
+        kind, change_id = payload.get("k"), payload.get("id")
+        if (kind, change_id) != (None, None) and (kind not in ("deleted", "task") or not isinstance(change_id, int)):
+            raise ValueError
+        return payload["cv"], kind, change_id
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def _cursor_condition(cursor: str, sort_by: str, descending: bool):
+    """
+    Build the keyset predicate selecting rows after the cursor position.
+    
+    Rows are ordered by (sort column NULLS LAST, id), so rows after a non-null
+    value are the strictly greater (or smaller when descending) values, the
+    equal values with a later id, and every NULL; rows after a NULL value are
+    the remaining NULLs with a later id.
+    """
+    payload = decode_task_cursor(cursor)
+    if payload.get("s") != sort_by or payload.get("d") != descending:
+        raise ValueError("Cursor does not match the requested sort order")
+    
+    sort_column = TASK_SORT_COLUMNS[sort_by]
+    value, last_id = payload["v"], payload["id"]
+    id_after = Task.id < last_id if descending else Task.id > last_id
+    
+    if value is None:
+        return and_(sort_column.is_(None), id_after)
+    
+    value_after = sort_column < value if descending else sort_column > value
+    return or_(
+        value_after,
+        and_(sort_column == value, id_after),
+        sort_column.is_(None)
+    )
 
 
 def get_completed_tasks(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Task]:
     """Get all completed tasks for a specific user."""
-    stmt = select(Task).options(selectinload(Task.category)).where(Task.completed == True, Task.user_id == user_id).offset(skip).limit(limit)
-    return list(db.scalars(stmt))
+    stmt = select(Task).where(Task.completed == True, Task.user_id == user_id).offset(skip).limit(limit)
+    return _fetch_tasks(db, user_id, stmt)
 
 
 def get_pending_tasks(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Task]:
     """Get all pending (incomplete) tasks for a specific user."""
-    stmt = select(Task).options(selectinload(Task.category)).where(Task.completed == False, Task.user_id == user_id).offset(skip).limit(limit)
-    return list(db.scalars(stmt))
+    stmt = select(Task).where(Task.completed == False, Task.user_id == user_id).offset(skip).limit(limit)
+    return _fetch_tasks(db, user_id, stmt)
 
 
 def get_high_priority_tasks(db: Session, user_id: int, priority_threshold: int = 7) -> List[Task]:
     """Get high priority tasks (priority >= threshold) for a specific user."""
-    stmt = select(Task).options(selectinload(Task.category)).where(Task.priority >= priority_threshold, Task.user_id == user_id)
-    return list(db.scalars(stmt))
+    stmt = select(Task).where(Task.priority >= priority_threshold, Task.user_id == user_id)
+    return _fetch_tasks(db, user_id, stmt)
 
 
 def get_tasks_by_priority(db: Session, priority: int) -> List[Task]:
@@ -219,30 +1015,30 @@ def get_tasks_by_category(db: Session, category_id: int) -> List[Task]:
 
 def get_overdue_tasks(db: Session, user_id: int) -> List[Task]:
     """Get overdue tasks for a specific user."""
-    from datetime import datetime
     now = datetime.utcnow()
-    stmt = select(Task).options(selectinload(Task.category)).where(
+    stmt = select(Task).where(
         and_(
             Task.due_date < now,
             Task.completed == False,
             Task.user_id == user_id
         )
     )
-    return list(db.scalars(stmt))
+    return _fetch_tasks(db, user_id, stmt)
 
 
 def get_tasks_due_today(db: Session, user_id: int) -> List[Task]:
     """Get tasks due today for a specific user."""
-    from datetime import datetime, date
-    today = date.today()
-    stmt = select(Task).options(selectinload(Task.category)).where(
+    # A half-open range (rather than date(due_date) = today) lets the due_date index serve it
+    start_of_today = datetime.combine(date.today(), time.min)
+    stmt = select(Task).where(
         and_(
-            func.date(Task.due_date) == today,
+            Task.due_date >= start_of_today,
+            Task.due_date < start_of_today + timedelta(days=1),
             Task.completed == False,
             Task.user_id == user_id
         )
     )
-    return list(db.scalars(stmt))
+    return _fetch_tasks(db, user_id, stmt)
 
 
 def count_tasks(db: Session) -> int:
@@ -280,72 +1076,64 @@ def get_tasks_by_multiple_priorities(db: Session, priorities: List[int]) -> List
     return list(db.scalars(stmt))
 
 
-def search_tasks_advanced(db: Session, search_terms: List[str], skip: int = 0, limit: int = 100) -> List[Task]:
-    """Advanced search with multiple terms."""
-    conditions = []
-    for term in search_terms:
-        search_pattern = f"%{term}%"
-        condition = or_(
-            Task.title.ilike(search_pattern),
-            Task.description.ilike(search_pattern)
-        )
-        conditions.append(condition)
+def search_tasks_advanced(db: Session, user_id: int, search_terms: List[str], skip: int = 0, limit: int = 100) -> List[Task]:
+    """Advanced search requiring every term to match, ranked by relevance."""
+    words = [word for term in search_terms for word in tokenize(term)]
+    if not words:
+        return []
     
-    stmt = select(Task).options(selectinload(Task.category)).where(and_(*conditions)).offset(skip).limit(limit)
-    return list(db.scalars(stmt))
+    stmt = select(Task).where(Task.user_id == user_id)
+    stmt = apply_text_search(db, stmt, words, match_all=True).offset(skip).limit(limit)
+    return _fetch_tasks(db, user_id, stmt)
 
 
-def search_tasks_full_text(db: Session, search_query: str, skip: int = 0, limit: int = 100) -> List[Task]:
-    """Full-text search across title and description."""
-    # Split search query into words for better matching
-    search_words = search_query.split()
-    
-    conditions = []
-    for word in search_words:
-        if len(word) >= 2:  # Only search for words with 2+ characters
-            search_pattern = f"%{word}%"
-            condition = or_(
-                Task.title.ilike(search_pattern),
-                Task.description.ilike(search_pattern)
-            )
-            conditions.append(condition)
+def search_tasks_full_text(
+    db: Session,
+    user_id: int,
+    search_query: str,
+    skip: int = 0,
+    limit: int = 100,
+    as_rows: bool = False,
+    fields: Optional[Sequence[str]] = None,
+    include_category: bool = True
+) -> List[Task]:
+    """
+    Full-text search across title and description, ranked by relevance.
     
-    if not conditions:
+    ``as_rows``, ``fields`` and ``include_category`` work as in _fetch_tasks.
+    """
+    # Only search for words with 2+ characters
+    words = tokenize(search_query, min_length=2)
+    if not words:
         # If no valid search words, return empty list
         return []
     
-    stmt = select(Task).options(selectinload(Task.category)).where(or_(*conditions)).offset(skip).limit(limit)
-    return list(db.scalars(stmt))
+    stmt = select(Task).where(Task.user_id == user_id)
+    stmt = apply_text_search(db, stmt, words).offset(skip).limit(limit)
+    return _fetch_tasks(db, user_id, stmt, as_rows, fields, include_category)
 
 
 def search_tasks_by_multiple_criteria(
     db: Session,
+    user_id: int,
     search_query: Optional[str] = None,
     priority_range: Optional[tuple] = None,
     category_ids: Optional[List[int]] = None,
     due_date_range: Optional[tuple] = None,
     completion_status: Optional[bool] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    as_rows: bool = False,
+    fields: Optional[Sequence[str]] = None,
+    include_category: bool = True
 ) -> List[Task]:
-    """Advanced search with multiple criteria simultaneously."""
-    stmt = select(Task).options(selectinload(Task.category))
-    conditions = []
+    """
+    Advanced search with multiple criteria simultaneously.
     
-    # Text search
-    if search_query:
-        search_words = search_query.split()
-        text_conditions = []
-        for word in search_words:
-            if len(word) >= 2:
-                search_pattern = f"%{word}%"
-                text_condition = or_(
-                    Task.title.ilike(search_pattern),
-                    Task.description.ilike(search_pattern)
-                )
-                text_conditions.append(text_condition)
-        if text_conditions:
-            conditions.append(or_(*text_conditions))
+    ``as_rows``, ``fields`` and ``include_category`` work as in _fetch_tasks.
+    """
+    stmt = select(Task).where(Task.user_id == user_id)
+    conditions = []
     
     # Priority range
     if priority_range:
@@ -369,34 +1157,72 @@ def search_tasks_by_multiple_criteria(
     if conditions:
         stmt = stmt.where(and_(*conditions))
     
+    # Text search (ranked by relevance)
+    if search_query:
+        words = tokenize(search_query, min_length=2)
+        if words:
+            stmt = apply_text_search(db, stmt, words)
+    
     # Apply pagination
     stmt = stmt.offset(skip).limit(limit)
     
-    return list(db.scalars(stmt))
+    return _fetch_tasks(db, user_id, stmt, as_rows, fields, include_category)
 
 
-def get_task_statistics(db: Session) -> dict:
-    """Get comprehensive task statistics."""
-    total_tasks = db.scalar(select(func.count(Task.id)))
-    completed_tasks = db.scalar(select(func.count(Task.id)).where(Task.completed == True))
-    pending_tasks = db.scalar(select(func.count(Task.id)).where(Task.completed == False))
-    overdue_tasks = len(get_overdue_tasks(db))
-    due_today_tasks = len(get_tasks_due_today(db))
-    high_priority_tasks = len(get_high_priority_tasks(db))
+def get_task_statistics(db: Session, user_id: int) -> dict:
+    """
+    Get comprehensive task statistics for a specific user.
     
-    # Priority distribution
-    priority_stats = {}
-    for priority in range(1, 11):
-        count = db.scalar(select(func.count(Task.id)).where(Task.priority == priority))
-        priority_stats[f"priority_{priority}"] = count
+    Totals come from the user's maintained summary row (a primary-key lookup).
+    Overdue and due-today depend on the clock rather than on writes, so they
+    are counted with one range scan of the pending-by-due-date index. The
+    result is cached briefly; task writes for the user invalidate it.
+    """
+    cached = _statistics_cache.get(user_id)
+    if cached is not None:
+        return cached
+    
+    stats = get_user_task_stats(db, user_id)
     
-    return {
+    now = datetime.utcnow()
+    start_of_today = datetime.combine(date.today(), time.min)
+    start_of_tomorrow = start_of_today + timedelta(days=1)
+    overdue_tasks, due_today_tasks = db.execute(
+        select(
+            func.count(case((Task.due_date < now, 1))),
+            func.count(case((Task.due_date >= start_of_today, 1)))
+        ).where(
+            Task.user_id == user_id,
+            Task.completed == False,
+            Task.due_date < start_of_tomorrow
+        )
+    ).one()
+    
+    total_tasks = stats.total if stats else 0
+    completed_tasks = stats.completed if stats else 0
+    priority_counts = [getattr(stats, f"priority_{priority}") if stats else 0 for priority in range(1, 11)]
+    
+    statistics = {
         "total": total_tasks,
         "completed": completed_tasks,
-        "pending": pending_tasks,
+        "pending": total_tasks - completed_tasks,
         "overdue": overdue_tasks,
         "due_today": due_today_tasks,
-        "high_priority": high_priority_tasks,
+        "high_priority": sum(priority_counts[6:]),  # priority >= 7
         "completion_rate": (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0,
-        "priority_distribution": priority_stats
+        "priority_distribution": {
+            f"priority_{priority}": count for priority, count in enumerate(priority_counts, start=1)
+        }
     }
+    _statistics_cache.set(user_id, statistics)
+    return statistics
+
+
+def statistics_cache_stats() -> dict:
+    """Hit/miss counters and size of the task statistics cache."""
+    return _statistics_cache.stats()
+
+
+def invalidate_task_caches(user_id: int) -> None:
+    """Drop cached data derived from a user's tasks; called after every task write."""
+    _statistics_cache.invalidate(user_id)
@@ -0,0 +1,94 @@
+"""
+Maintenance of the per-user task summary table.
+"""
+from collections import defaultdict
+from typing import Iterable, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, insert, func, case
+from app.models.task import Task
+from app.models.user import User
+from app.models.task_stats import UserTaskStats
+
+# (completed, priority, number of tasks in that state)
+TaskState = Tuple[bool, Optional[int], int]
+
+PRIORITY_LEVELS = range(1, 11)
+
+
+def task_state(task: Task) -> TaskState:
+    """Describe a single task for task_stats_delta."""
+    return bool(task.completed), task.priority, 1
+
+
+def task_stats_delta(removed: Iterable[TaskState] = (), added: Iterable[TaskState] = ()) -> dict:
+    """
+    Compute the column increments for tasks leaving and entering the given states.
+    
+    An update is a removal of the old state plus an addition of the new one.
+    """
+    delta = defaultdict(int)
+    for sign, states in ((-1, removed), (1, added)):
+        for completed, priority, count in states:
+            delta["total"] += sign * count
+            if completed:
+                delta["completed"] += sign * count
+            if priority in PRIORITY_LEVELS:
+                delta[f"priority_{priority}"] += sign * count
+    return {column: value for column, value in delta.items() if value}
+
+
+def adjust_task_stats(db: Session, user_id: int, delta: dict) -> None:
+    """
+    Apply a task_stats_delta to a user's summary row inside the caller's transaction.
+    
+    The task changes the delta describes must already be flushed: when the
+    user has no summary row yet it is built from the tasks table instead.
+    """
+    if not delta:
+        return
+    
+    stmt = update(UserTaskStats).where(UserTaskStats.user_id == user_id).values({
+        column: getattr(UserTaskStats, column) + value for column, value in delta.items()
+    })
+    if db.execute(stmt).rowcount == 0:
+        rebuild_task_stats(db, user_id=user_id)
+
+
+def rebuild_task_stats(db: Session, user_id: Optional[int] = None) -> None:
+    """
+    Recompute summary rows from the tasks table, for one user or for everyone.
+    
+    Runs in the caller's transaction; the caller commits.
+    """
+    def count_where(condition):
+        return func.count(case((condition, 1)))
+    
+    source = (
+        select(
+            User.id,
+            func.count(Task.id),
+            count_where(Task.completed == True),
+            *(count_where(Task.priority == priority) for priority in PRIORITY_LEVELS)
+        )
+        .select_from(User)
+        .outerjoin(Task, Task.user_id == User.id)
+        .group_by(User.id)
+    )
+    clear = delete(UserTaskStats)
+    if user_id is not None:
+        source = source.where(User.id == user_id)
+        clear = clear.where(UserTaskStats.user_id == user_id)
+    
+    columns = ["user_id", "total", "completed"] + [f"priority_{priority}" for priority in PRIORITY_LEVELS]
+    db.execute(clear)
+    db.execute(insert(UserTaskStats).from_select(columns, source))
+
+
+def get_user_task_stats(db: Session, user_id: int) -> Optional[UserTaskStats]:
+    """
+    Get a user's summary row, or None (all zeros) if it does not exist.
+    
+    Read-only, so it can run on a read session: users get their row when they
+    are created, and adjust_task_stats builds a missing one on the next task write.
+    """
+    return db.get(UserTaskStats, user_id)
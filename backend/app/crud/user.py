@@ -2,10 +2,12 @@
 User CRUD operations.
 """
 from sqlalchemy.orm import Session
+from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError
 from app.models.user import User
+from app.models.task_stats import UserTaskStats
 from app.schemas.auth import UserCreate, UserUpdate
-from app.core.auth import get_password_hash, verify_password
+from app.core.auth import get_password_hash, invalidate_cached_user, verify_password
 from typing import Optional
 
 
@@ -19,13 +21,23 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
 
-def create_user(db: Session, user: UserCreate) -> User:
-    """Create a new user."""
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None) -> User:
+    """
+    Create a new user.
+    
+    Route handlers pass hashed_password, computed off the event loop with
+    app.core.auth.hash_password; otherwise the password is hashed here.
+    """
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     db_user = User(
         email=user.email,
         hashed_password=hashed_password
     )
+    # Start the task summary at zero, so reads never have to build it
+    db_user.task_stats = UserTaskStats(
+        total=0, completed=0, **{f"priority_{priority}": 0 for priority in range(1, 11)}
+    )
     
     try:
         db.add(db_user)
@@ -50,6 +62,7 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[
             setattr(db_user, field, value)
         
         db.commit()
+        invalidate_cached_user(user_id)
         db.refresh(db_user)
         return db_user
     except IntegrityError:
@@ -57,6 +70,92 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[
         raise ValueError("User with this email already exists")
 
 
+def update_password_hash(db: Session, user_id: int, hashed_password: str) -> Optional[User]:
+    """Replace a user's password hash, e.g. with a rehash at the current bcrypt cost."""
+    db_user = get_user_by_id(db, user_id)
+    if not db_user:
+        return None
+    
+    db_user.hashed_password = hashed_password
+    db.commit()
+    invalidate_cached_user(user_id)
+    db.refresh(db_user)
+    return db_user
+
+
+def lock_user_row(db: Session, user_id: int) -> None:
+    """
+    Lock a user's row until the caller's transaction ends (SELECT ... FOR UPDATE).
+    
+    Writes that derive counter or task stats deltas from a task's previous
+    state take this before reading that state, so concurrent writes to the
+    same task queue up behind each other instead of applying the same delta
+    twice. It is the same row lock adjust_user_counters takes, so the lock
+    order is the same for every write. SQLite has no row locks and ignores
+    FOR UPDATE; its writes are already serialized by the writer queue.
+    """
+    db.execute(select(User.id).where(User.id == user_id).with_for_update())
+
+
+def adjust_user_counters(db: Session, user_id: int, tasks: int = 0, categories: int = 0) -> int:
+    """
+    Adjust a user's maintained task/category totals by the given deltas.
+    
+    Also bumps the user's collection version, so callers that adjust the
+    counters need not call bump_collection_version. Runs in the caller's
+    transaction, so the counters commit or roll back together with the rows
+    they count.
+    
+    Returns:
+        The new collection version
+    """
+    values = {"collection_version": User.collection_version + 1}
+    if tasks:
+        values["task_count"] = User.task_count + tasks
+    if categories:
+        values["category_count"] = User.category_count + categories
+    return db.scalar(update(User).where(User.id == user_id).values(**values).returning(User.collection_version))
+
+
+def bump_collection_version(db: Session, user_id: int) -> int:
+    """
+    Mark a user's tasks and categories as changed, in the caller's transaction.
+    
+    Every task and category write calls this (or adjust_user_counters); the
+    list endpoints derive their ETags from the version. The UPDATE locks the
+    user's row until commit, so a user's writes get increasing versions in
+    commit order; task writes stamp the returned version on the rows they
+    change, which makes it the change sequence of GET /tasks/changes.
+    
+    Returns:
+        The new collection version
+    """
+    return adjust_user_counters(db, user_id)
+
+
+def get_user_counters(db: Session, user_id: int) -> dict:
+    """
+    Get a user's task_count, category_count and collection_version in one primary-key lookup.
+    
+    The list endpoints load these once for the ETag and pass them on, so the
+    totals and the category cache check need no further user queries.
+    """
+    row = db.execute(
+        select(User.task_count, User.category_count, User.collection_version).where(User.id == user_id)
+    ).mappings().one_or_none()
+    return dict(row) if row else {"task_count": 0, "category_count": 0, "collection_version": 0}
+
+
+def get_collection_version(db: Session, user_id: int) -> int:
+    """Get a user's collection version (a primary-key lookup)."""
+    return db.scalar(select(User.collection_version).where(User.id == user_id)) or 0
+
+
+def get_tombstones_pruned_version(db: Session, user_id: int) -> int:
+    """Get the collection version up to which a user's task tombstones were pruned."""
+    return db.scalar(select(User.tombstones_pruned_version).where(User.id == user_id)) or 0
+
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     """Authenticate user with email and password."""
     user = get_user_by_email(db, email)
@@ -75,6 +174,7 @@ def delete_user(db: Session, user_id: int) -> bool:
     
     db.delete(db_user)
     db.commit()
+    invalidate_cached_user(user_id)
     return True
 
 
@@ -5,7 +5,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api import tasks_router, categories_router, auth_router
-from app.core.database import engine
+from app.core.auth import token_cache_stats, user_cache_stats
+from app.core.database import engine, pool_stats
+from app.crud.task import statistics_cache_stats
 from app.models import task, category, user
 
 # Create database tables
@@ -52,3 +54,15 @@ async def root():
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/health/database")
+async def database_health_check():
+    """Connection pool occupancy and checkout wait metrics of this worker, for pool sizing."""
+    return {"pools": pool_stats()}
+
+
+@app.get("/health/cache")
+async def cache_health_check():
+    """Hit/miss counters of this worker's in-process caches."""
+    return {"users": user_cache_stats(), "tokens": token_cache_stats(), "statistics": statistics_cache_stats()}
@@ -4,6 +4,8 @@ Database models.
 from .task import Task
 from .category import Category
 from .user import User
+from .task_stats import UserTaskStats
+from .task_tombstone import TaskTombstone
 
-__all__ = ["Task", "Category", "User"]
+__all__ = ["Task", "Category", "User", "UserTaskStats", "TaskTombstone"]
 
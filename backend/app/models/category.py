@@ -5,6 +5,7 @@ from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.models.search_index import register_sqlite_fts_mirror, register_postgresql_ddl
 
 
 class Category(Base):
@@ -27,3 +28,12 @@ class Category(Base):
     
     def __repr__(self):
         return f"<Category(id={self.id}, name='{self.name}', color='{self.color}')>"
+
+
+# Trigram indexes serving substring matches of the list ``search`` filter
+register_sqlite_fts_mirror(Category.__table__, "categories_trgm", ["name", "description"], tokenize="trigram")
+register_postgresql_ddl(Category.__table__, [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_categories_name_trgm ON categories USING GIN (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_categories_description_trgm ON categories USING GIN (description gin_trgm_ops)",
+])
@@ -0,0 +1,43 @@
+"""
+DDL helpers for SQLite FTS5 side tables that mirror a regular table.
+"""
+from typing import List, Optional
+from sqlalchemy import DDL, Table, event
+
+
+def sqlite_fts_mirror_ddl(source: str, name: str, columns: List[str], tokenize: Optional[str] = None) -> List[str]:
+    """
+    Build the statements creating an external-content FTS5 table over ``source``.
+    
+    The triggers keep the index in step with every insert, delete and update of
+    the mirrored columns, whichever code path performs the write.
+    """
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    options = f", tokenize='{tokenize}'" if tokenize else ""
+    
+    insert_new = f"INSERT INTO {name}(rowid, {column_list}) VALUES (new.id, {new_values}); "
+    delete_old = f"INSERT INTO {name}({name}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+    
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5("
+        f"{column_list}, content='{source}', content_rowid='id'{options})",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {source} BEGIN {insert_new}END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {source} BEGIN {delete_old}END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {column_list} ON {source} BEGIN "
+        f"{delete_old}{insert_new}END",
+    ]
+
+
+def register_sqlite_fts_mirror(table: Table, name: str, columns: List[str], tokenize: Optional[str] = None) -> None:
+    """Create the FTS5 mirror whenever ``table`` is created on SQLite, and drop it with the table."""
+    for statement in sqlite_fts_mirror_ddl(table.name, name, columns, tokenize):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(table, "before_drop", DDL(f"DROP TABLE IF EXISTS {name}").execute_if(dialect="sqlite"))
+
+
+def register_postgresql_ddl(table: Table, statements: List[str]) -> None:
+    """Run extra PostgreSQL-only statements after ``table`` is created."""
+    for statement in statements:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
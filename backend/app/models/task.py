@@ -1,10 +1,25 @@
 """
 Task model for the database.
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from sqlalchemy.dialects import sqlite
 from app.core.database import Base
+from app.models.search_index import register_sqlite_fts_mirror, register_postgresql_ddl
+
+# SQLite renders func.now() server defaults as 'YYYY-MM-DD HH:MM:SS'; bind values in the
+# same format so comparisons against these columns (keyset pagination) line up
+ServerTimestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite"
+)
+
+# Fractional-index order keys (app.core.ordering) must sort byte-wise, which is
+# SQLite's default; PostgreSQL needs the "C" collation instead of the locale's
+OrderKey = String(255).with_variant(String(255, collation="C"), "postgresql")
 
 
 class Task(Base):
@@ -12,17 +27,38 @@ class Task(Base):
     
     __tablename__ = "tasks"
     
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(255), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    completed = Column(Boolean, default=False, index=True)
-    priority = Column(Integer, default=5, index=True)  # 1-10 scale
-    due_date = Column(DateTime(timezone=True), nullable=True, index=True)
-    order_index = Column(Float, default=0.0, index=True)  # For drag-and-drop reordering
+    completed = Column(Boolean, default=False)
+    priority = Column(Integer, default=5)  # 1-10 scale
+    due_date = Column(DateTime(timezone=True), nullable=True)
+    order_index = Column(OrderKey, nullable=False)  # Drag-and-drop position, see app.core.ordering
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)  # User relationship
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # User relationship
+    created_at = Column(ServerTimestamp, server_default=func.now())
+    updated_at = Column(ServerTimestamp, onupdate=func.now())
+    change_version = Column(Integer, nullable=False, default=0, server_default="0")  # User's collection version of the last write
+    
+    # Every query is scoped to a user first, so indexes lead with user_id and then
+    # follow the column that query filters or sorts on (see docs/QUERY_PLANS.md)
+    __table_args__ = (
+        Index("ix_tasks_user_order", "user_id", "order_index", "id"),
+        Index("ix_tasks_user_title", "user_id", "title"),
+        Index("ix_tasks_user_priority", "user_id", "priority"),
+        Index("ix_tasks_user_created", "user_id", "created_at", "id"),
+        Index("ix_tasks_user_completed_due", "user_id", "completed", "due_date"),
+        Index("ix_tasks_user_change", "user_id", "change_version", "id"),
+        # Pending-only indexes for the overdue / due-today / pending list queries
+        Index(
+            "ix_tasks_user_pending_due", "user_id", "due_date",
+            postgresql_where=(completed == False), sqlite_where=(completed == False)
+        ),
+        Index(
+            "ix_tasks_user_pending_order", "user_id", "order_index", "id",
+            postgresql_where=(completed == False), sqlite_where=(completed == False)
+        ),
+    )
     
     # Relationships
     category = relationship("Category", back_populates="tasks")
@@ -31,3 +67,20 @@ class Task(Base):
     def __repr__(self):
         return f"<Task(id={self.id}, title='{self.title}', completed={self.completed})>"
 
+
+# Full-text search index over title and description (see app.core.search)
+register_sqlite_fts_mirror(Task.__table__, "tasks_fts", ["title", "description"])
+register_postgresql_ddl(Task.__table__, [
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)",
+])
+
+# Trigram indexes serving substring matches of the list ``search`` filter
+register_sqlite_fts_mirror(Task.__table__, "tasks_trgm", ["title", "description"], tokenize="trigram")
+register_postgresql_ddl(Task.__table__, [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_title_trgm ON tasks USING GIN (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_description_trgm ON tasks USING GIN (description gin_trgm_ops)",
+])
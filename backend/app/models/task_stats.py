@@ -0,0 +1,38 @@
+"""
+Per-user task summary model.
+"""
+from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+class UserTaskStats(Base):
+    """
+    Running task totals for one user.
+    
+    Maintained by the task write paths in the same transaction as the task
+    change (see app.crud.task_stats) and rebuilt from scratch by
+    reconcile_task_stats.py.
+    """
+    
+    __tablename__ = "user_task_stats"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    priority_1 = Column(Integer, nullable=False, default=0)
+    priority_2 = Column(Integer, nullable=False, default=0)
+    priority_3 = Column(Integer, nullable=False, default=0)
+    priority_4 = Column(Integer, nullable=False, default=0)
+    priority_5 = Column(Integer, nullable=False, default=0)
+    priority_6 = Column(Integer, nullable=False, default=0)
+    priority_7 = Column(Integer, nullable=False, default=0)
+    priority_8 = Column(Integer, nullable=False, default=0)
+    priority_9 = Column(Integer, nullable=False, default=0)
+    priority_10 = Column(Integer, nullable=False, default=0)
+    
+    # Relationships
+    user = relationship("User", back_populates="task_stats")
+    
+    def __repr__(self):
+        return f"<UserTaskStats(user_id={self.user_id}, total={self.total}, completed={self.completed})>"
@@ -0,0 +1,35 @@
+"""
+Task tombstone model for delta sync.
+"""
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+from app.models.task import ServerTimestamp
+
+
+class TaskTombstone(Base):
+    """
+    Record of a deleted task, kept so that GET /tasks/changes can report it.
+    
+    Written by the task delete paths in the same transaction as the delete,
+    stamped with the user's collection version of that write.
+    """
+    
+    __tablename__ = "task_tombstones"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    task_id = Column(Integer, nullable=False)  # The task row is gone, so no foreign key
+    change_version = Column(Integer, nullable=False)
+    deleted_at = Column(ServerTimestamp, server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_task_tombstones_user_change", "user_id", "change_version"),
+    )
+    
+    # Relationships
+    user = relationship("User", back_populates="task_tombstones")
+    
+    def __repr__(self):
+        return f"<TaskTombstone(task_id={self.task_id}, change_version={self.change_version})>"
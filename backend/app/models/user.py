@@ -15,12 +15,18 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
+    task_count = Column(Integer, nullable=False, default=0, server_default="0")  # Maintained by task create/delete
+    category_count = Column(Integer, nullable=False, default=0, server_default="0")  # Maintained by category create/delete
+    collection_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped by every task/category write
+    tombstones_pruned_version = Column(Integer, nullable=False, default=0, server_default="0")  # Task deletions up to it are pruned
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     tasks = relationship("Task", back_populates="user", cascade="all, delete-orphan")
     categories = relationship("Category", back_populates="user", cascade="all, delete-orphan")
+    task_stats = relationship("UserTaskStats", back_populates="user", uselist=False, cascade="all, delete-orphan")
+    task_tombstones = relationship("TaskTombstone", back_populates="user", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<User(id={self.id}, email='{self.email}')>"
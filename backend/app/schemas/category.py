@@ -53,6 +53,6 @@ class CategoryResponse(CategoryBase):
 class CategoryListResponse(BaseModel):
     """Schema for category list response."""
     categories: List[CategoryResponse]
-    total: int
+    total: Optional[int] = None  # None when the list was requested with count=none
     page: int
     size: int
@@ -4,6 +4,7 @@ Task schemas for API validation.
 from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from datetime import datetime
+from app.core.ordering import validate_order_key
 
 
 class TaskBase(BaseModel):
@@ -34,19 +35,24 @@ class TaskUpdate(BaseModel):
     priority: Optional[int] = Field(None, ge=1, le=10)
     due_date: Optional[datetime] = None
     category_id: Optional[int] = None
-    order_index: Optional[float] = None
+    order_index: Optional[str] = Field(None, max_length=255)
     
     @validator('title')
     def validate_title(cls, v):
         if v is not None and not v.strip():
             raise ValueError('Title cannot be empty or whitespace only')
         return v.strip() if v else v
+    
+    @validator('order_index')
+    def validate_order_index(cls, v):
+        return validate_order_key(v) if v is not None else v
 
 
 class TaskReorder(BaseModel):
-    """Schema for reordering tasks."""
+    """Schema for moving a task between two neighbours."""
     task_id: int = Field(..., description="ID of the task to reorder")
-    new_order_index: float = Field(..., description="New order index for the task")
+    after_task_id: Optional[int] = Field(None, description="Task that should come right before it (omit for the top)")
+    before_task_id: Optional[int] = Field(None, description="Task that should come right after it (omit for the bottom)")
 
 
 class BulkTaskUpdate(BaseModel):
@@ -55,11 +61,25 @@ class BulkTaskUpdate(BaseModel):
     updates: TaskUpdate = Field(..., description="Updates to apply to all tasks")
 
 
+class TaskImportError(BaseModel):
+    """A row rejected by batch creation or import."""
+    row: int = Field(..., description="Array index (batch) or line number (import) of the row")
+    detail: str
+
+
+class TaskImportResponse(BaseModel):
+    """Outcome of batch creation or import."""
+    accepted: int
+    rejected: int
+    errors: List[TaskImportError] = []
+    errors_truncated: bool = False  # True when more rows were rejected than are listed
+
+
 class TaskResponse(TaskBase):
     """Schema for task response."""
     id: int
     completed: bool
-    order_index: float
+    order_index: str
     user_id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -72,9 +92,24 @@ class TaskResponse(TaskBase):
 class TaskListResponse(BaseModel):
     """Schema for task list response."""
     tasks: List[TaskResponse]
-    total: int
+    total: Optional[int] = None  # None when the list was requested with count=none
     page: int
     size: int
+    next_cursor: Optional[str] = None
+
+
+class TaskTombstoneResponse(BaseModel):
+    """A deleted task in a changes response."""
+    id: int
+    deleted_at: Optional[datetime] = None
+
+
+class TaskChangesResponse(BaseModel):
+    """Tasks changed and deleted since a change cursor."""
+    tasks: List[TaskResponse]  # Created or updated; apply after deleted
+    deleted: List[TaskTombstoneResponse]
+    cursor: str  # Pass as since on the next call
+    has_more: bool  # True when the page ended before the latest change
 
 
 # Import here to avoid circular imports
@@ -0,0 +1,77 @@
+"""
+Per-request authentication CPU microbenchmark.
+
+Times what get_current_user spends on a repeated bearer token: verify_token
+with an empty claims cache (a full python-jose decode and HMAC check each
+time) against verify_token served from the cache, and the whole dependency
+with both the token and user caches cold (decode plus user query) and warm.
+
+Usage:
+    python benchmarks/auth_tokens.py [--iterations 20000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _per_call_us(function, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        function()
+    return round(1e6 * (time.process_time() - start) / iterations, 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{directory}/bench.db")
+    sys.path.insert(0, BACKEND_DIR)
+    from fastapi.security import HTTPAuthorizationCredentials
+    from app.core import auth
+    from app.core.database import Base, SessionLocal, engine
+    from app.models.user import User
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        user = User(email="bench@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        token = auth.create_access_token({"sub": str(user.id)})
+
+    def uncached():
+        auth._claims_cache.clear()
+        auth.verify_token(token)
+
+    def cold_dependency():
+        auth._claims_cache.clear()
+        auth._user_cache.clear()
+        loop.run_until_complete(auth.get_current_user(credentials, db))
+
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    db = SessionLocal()
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(auth.get_current_user(credentials, db))
+
+    results = {
+        "verify_token, uncached": _per_call_us(uncached, args.iterations),
+        "verify_token, cached": _per_call_us(lambda: auth.verify_token(token), args.iterations),
+        "get_current_user, cold caches": _per_call_us(cold_dependency, args.iterations // 10),
+        "get_current_user, warm caches": _per_call_us(
+            lambda: loop.run_until_complete(auth.get_current_user(credentials, db)), args.iterations
+        ),
+    }
+    db.close()
+    for name, value in results.items():
+        print(f"{name:32} {value:>8} us CPU per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Concurrent write benchmark for the SQLite connection profile.
+
+Runs the same workload against a fresh SQLite file with SQLITE_PROFILE off
+(rollback journal, driver defaults, no writer queue) and on (WAL, pragmas,
+writer queue): concurrent writers create tasks through app.crud.aio while
+concurrent readers list tasks, as route handlers would. Reports the total time
+for the fixed mix and per-operation latency percentiles.
+
+Usage:
+    python benchmarks/sqlite_writes.py [--writers 16] [--tasks 50] [--readers 4] [--reads 200]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return round(1000 * ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 2) if ordered else 0.0
+
+
+async def _workload(writers: int, tasks_per_writer: int, readers: int, reads_per_reader: int) -> dict:
+    from sqlalchemy.exc import OperationalError
+    from app.core.database import Base, SessionLocal, engine
+    from app.crud import aio
+    from app.models.user import User
+    from app.schemas.task import TaskCreate
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        user = User(email="bench@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    write_times, read_times, errors = [], [], []
+
+    async def timed(samples: list, call) -> None:
+        db = SessionLocal()
+        start = time.perf_counter()
+        try:
+            await call(db)
+            samples.append(time.perf_counter() - start)
+        except OperationalError as e:
+            errors.append(str(e.orig))
+        finally:
+            db.close()
+
+    async def writer(number: int) -> None:
+        for index in range(tasks_per_writer):
+            title = f"w{number}-{index}"
+            await timed(write_times, lambda db: aio.create_task(db, TaskCreate(title=title), user_id))
+
+    async def reader() -> None:
+        for _ in range(reads_per_reader):
+            await timed(read_times, lambda db: aio.get_tasks_with_filters(db, user_id=user_id, limit=50))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(number) for number in range(writers)), *(reader() for _ in range(readers)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "seconds": round(elapsed, 3),
+        "errors": len(errors),
+        "write_p50_ms": _percentile(write_times, 0.5),
+        "write_p99_ms": _percentile(write_times, 0.99),
+        "read_p50_ms": _percentile(read_times, 0.5),
+        "read_p99_ms": _percentile(read_times, 0.99),
+    }
+
+
+def _run(profile: bool, args) -> dict:
+    """Run the workload in a fresh interpreter, since settings are read at import time."""
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{directory}/bench.db",
+            "SQLITE_PROFILE": str(profile).lower(),
+            "DATABASE_ASYNC": "false",
+        }
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", "--writers", str(args.writers),
+             "--tasks", str(args.tasks), "--readers", str(args.readers), "--reads", str(args.reads)],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=16, help="Concurrent writers")
+    parser.add_argument("--tasks", type=int, default=50, help="Tasks created per writer")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent readers")
+    parser.add_argument("--reads", type=int, default=200, help="Task lists read per reader")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, BACKEND_DIR)
+        print(json.dumps(asyncio.run(_workload(args.writers, args.tasks, args.readers, args.reads))))
+        return
+
+    print(f"{args.writers} writers x {args.tasks} tasks, {args.readers} readers x {args.reads} reads")
+    for profile in (False, True):
+        result = _run(profile, args)
+        print(f"SQLITE_PROFILE={str(profile).lower():5}  " + "  ".join(f"{k}={v}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Task list response encoding benchmark.
+
+Serves GET /tasks?limit=1000 and GET /tasks/search/advanced?limit=1000 for a
+user with 1000 tasks (half of them in a category) through the ASGI app, with
+FAST_JSON_RESPONSES off (ORM objects validated into the response models) and
+on (plain rows encoded with orjson), and reports request latency percentiles.
+
+Usage:
+    python benchmarks/task_list_encoding.py [--requests 200] [--tasks 1000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return round(1000 * ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 2)
+
+
+def _workload(requests: int, tasks: int) -> dict:
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        registered = client.post("/auth/register", json={
+            "email": "bench@example.com", "password": "benchmark-password", "confirm_password": "benchmark-password"
+        }).json()
+        headers = {"Authorization": "Bearer " + registered["token"]["access_token"]}
+        category = client.post("/categories/", json={"name": "Work"}, headers=headers).json()
+        rows = [
+            {"title": f"Task {index}", "description": "Benchmark task " * 4, "priority": index % 10 + 1,
+             "due_date": "2030-01-01T09:30:00", "category_id": category["id"] if index % 2 else None}
+            for index in range(tasks)
+        ]
+        for start in range(0, tasks, 1000):
+            client.post("/tasks/batch", json=rows[start:start + 1000], headers=headers)
+
+        results = {}
+        for name, url in (
+            ("list", f"/tasks/?limit={tasks}"),
+            ("search", f"/tasks/search/advanced?priority_min=1&limit={tasks}"),
+        ):
+            client.get(url, headers=headers)  # warm up
+            samples = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = client.get(url, headers=headers)
+                samples.append(time.perf_counter() - start)
+                assert response.status_code == 200
+            results[f"{name}_p50_ms"] = _percentile(samples, 0.5)
+            results[f"{name}_p99_ms"] = _percentile(samples, 0.99)
+            results[f"{name}_bytes"] = len(response.content)
+        return results
+
+
+def _run(fast: bool, args) -> dict:
+    """Run the workload in a fresh interpreter, since settings are read at import time."""
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{directory}/bench.db",
+            "FAST_JSON_RESPONSES": str(fast).lower(),
+            "BCRYPT_ROUNDS": "4",
+        }
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", "--requests", str(args.requests), "--tasks", str(args.tasks)],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--tasks", type=int, default=1000, help="Tasks in the listed page")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, BACKEND_DIR)
+        print(json.dumps(_workload(args.requests, args.tasks)))
+        return
+
+    print(f"{args.requests} requests per endpoint, limit={args.tasks}")
+    for fast in (False, True):
+        result = _run(fast, args)
+        print(f"FAST_JSON_RESPONSES={str(fast).lower():5}  " + "  ".join(f"{k}={v}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    main()
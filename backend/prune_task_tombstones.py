@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Delete task tombstones older than the retention horizon.
+
+Changes cursors from before the pruned deletions get 410 from GET /tasks/changes
+and their clients resync. Run it periodically, e.g. daily from cron.
+
+Usage:
+    python prune_task_tombstones.py            # TASK_TOMBSTONE_RETENTION_DAYS
+    python prune_task_tombstones.py --days 7
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud.task import prune_task_tombstones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prune old task tombstones")
+    parser.add_argument(
+        "--days", type=int, default=settings.TASK_TOMBSTONE_RETENTION_DAYS,
+        help="Keep deletions from the last DAYS days"
+    )
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        pruned = prune_task_tombstones(db, datetime.now(timezone.utc) - timedelta(days=args.days))
+        db.commit()
+    finally:
+        db.close()
+    
+    print(f"Pruned {pruned} task tombstones older than {args.days} days")
+
+
+if __name__ == "__main__":
+    main()
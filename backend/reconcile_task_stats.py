@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Rebuild the user_task_stats summary table from the tasks table.
+
+Usage:
+    python reconcile_task_stats.py            # every user
+    python reconcile_task_stats.py --user 42  # a single user
+"""
+import argparse
+from app.core.database import SessionLocal
+from app.crud.task_stats import rebuild_task_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild per-user task statistics")
+    parser.add_argument("--user", type=int, default=None, help="Only rebuild this user ID")
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        rebuild_task_stats(db, user_id=args.user)
+        db.commit()
+    finally:
+        db.close()
+    
+    target = f"user {args.user}" if args.user is not None else "all users"
+    print(f"Rebuilt task statistics for {target}")
+
+
+if __name__ == "__main__":
+    main()
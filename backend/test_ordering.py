@@ -0,0 +1,142 @@
+"""
+Unit tests for the fractional-index order keys in app.core.ordering.
+"""
+import random
+
+import pytest
+
+from app.core.ordering import (
+    FIRST_KEY,
+    generate_key_between,
+    generate_n_keys_between,
+    plan_reorder,
+    validate_order_key,
+)
+
+
+def apply_plan(keys, changes):
+    """The keys after applying plan_reorder's changes."""
+    return [changes.get(position, key) for position, key in enumerate(keys)]
+
+
+def test_first_key_of_empty_list():
+    assert generate_key_between(None, None) == FIRST_KEY
+
+
+@pytest.mark.parametrize("before, expected", [
+    ("a0", "a1"),
+    ("az", "b00"),  # carries into the next integer length
+    ("b0z", "b10"),
+    ("a0V", "a1"),  # appending drops the fraction
+])
+def test_append_increments_integer_part(before, expected):
+    assert generate_key_between(before, None) == expected
+
+
+@pytest.mark.parametrize("after, expected", [
+    ("a1", "a0"),
+    ("a0", "Zz"),  # borrows into the negative integers
+    ("b00", "az"),
+])
+def test_prepend_decrements_integer_part(after, expected):
+    assert generate_key_between(None, after) == expected
+
+
+@pytest.mark.parametrize("before, after", [
+    ("a0", "a1"),
+    ("a0", "a0V"),
+    ("a0V", "a0W"),
+    ("a0z", "a1"),
+    ("Zz", "a0"),
+    ("az", "b00"),
+    ("a0", "b00"),
+])
+def test_key_between_neighbours(before, after):
+    key = generate_key_between(before, after)
+    assert before < key < after
+    assert validate_order_key(key) == key
+
+
+def test_repeated_inserts_stay_ordered():
+    rng = random.Random(42)
+    keys = [generate_key_between(None, None)]
+    for _ in range(500):
+        position = rng.randint(0, len(keys))
+        before = keys[position - 1] if position else None
+        after = keys[position] if position < len(keys) else None
+        keys.insert(position, generate_key_between(before, after))
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+
+
+@pytest.mark.parametrize("before, after", [
+    ("a1", "a0"),
+    ("a0", "a0"),
+    ("a0", "a00"),  # trailing zero in the fraction
+    ("", None),
+    ("a!", None),
+])
+def test_invalid_bounds_raise(before, after):
+    with pytest.raises(ValueError):
+        generate_key_between(before, after)
+
+
+@pytest.mark.parametrize("before, after", [(None, None), ("a0", None), (None, "a0"), ("a0", "a1"), ("a0", "b00")])
+@pytest.mark.parametrize("n", [1, 2, 7, 100])
+def test_n_keys_ascend_between_bounds(before, after, n):
+    keys = generate_n_keys_between(before, after, n)
+    assert len(keys) == n
+    assert keys == sorted(set(keys))
+    assert before is None or before < keys[0]
+    assert after is None or keys[-1] < after
+
+
+def test_n_keys_zero():
+    assert generate_n_keys_between("a0", "a1", 0) == []
+
+
+def test_plan_reorder_sorted_keys_unchanged():
+    assert plan_reorder(generate_n_keys_between(None, None, 10)) == {}
+
+
+@pytest.mark.parametrize("source, target", [(0, 9), (9, 0), (3, 6), (6, 2)])
+def test_plan_reorder_moving_one_item_changes_one_key(source, target):
+    keys = generate_n_keys_between(None, None, 10)
+    keys.insert(target, keys.pop(source))
+    changes = plan_reorder(keys)
+    assert list(changes) == [target]
+    reordered = apply_plan(keys, changes)
+    assert reordered == sorted(reordered)
+
+
+def test_plan_reorder_reversed_keeps_one_key():
+    keys = generate_n_keys_between(None, None, 8)[::-1]
+    changes = plan_reorder(keys)
+    assert len(changes) == 7
+    reordered = apply_plan(keys, changes)
+    assert reordered == sorted(set(reordered))
+
+
+def test_plan_reorder_changes_only_items_off_the_longest_run():
+    rng = random.Random(7)
+    keys = generate_n_keys_between(None, None, 50)
+    rng.shuffle(keys)
+    changes = plan_reorder(keys)
+    reordered = apply_plan(keys, changes)
+    assert reordered == sorted(set(reordered))
+
+    # No more changes than items off a longest increasing subsequence (O(n^2) reference)
+    longest = [1] * len(keys)
+    for i in range(len(keys)):
+        for j in range(i):
+            if keys[j] < keys[i]:
+                longest[i] = max(longest[i], longest[j] + 1)
+    assert len(changes) == len(keys) - max(longest)
+
+
+def test_plan_reorder_assigns_missing_keys():
+    keys = ["a0", None, "a2", None]
+    changes = plan_reorder(keys)
+    assert set(changes) == {1, 3}
+    reordered = apply_plan(keys, changes)
+    assert reordered == sorted(reordered)
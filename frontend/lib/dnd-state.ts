@@ -57,17 +57,7 @@ export function useDragAndDropState() {
     const [draggedTask] = newTasks.splice(draggedIndex, 1)
     newTasks.splice(dropIndex, 0, draggedTask)
 
-    // Update order_index for all affected tasks
-    const startIndex = Math.min(draggedIndex, dropIndex)
-    const endIndex = Math.max(draggedIndex, dropIndex)
-    
-    for (let i = startIndex; i <= endIndex; i++) {
-      newTasks[i] = {
-        ...newTasks[i],
-        order_index: i,
-      }
-    }
-
+    // Order keys are assigned by the server; the array order is what is displayed
     return newTasks
   }, [])
 
@@ -16,7 +16,7 @@ export interface Task {
   completed: boolean
   priority: number
   due_date?: string
-  order_index: number
+  order_index: string  // Fractional-index order key; compare as plain strings
   category_id?: number
   user_id: number
   category?: Category
@@ -39,7 +39,7 @@ export interface TaskUpdate {
   priority?: number
   due_date?: string
   category_id?: number
-  order_index?: number
+  order_index?: string
 }
 
 export interface TaskListResponse {
@@ -47,6 +47,7 @@ export interface TaskListResponse {
   total: number
   page: number
   size: number
+  next_cursor?: string | null
 }
 
 export interface TaskFilters {